@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict
+
+import networkx as nx
+import numpy as np
+
+from src.compiled import CompiledDAG, compile_edge_arrays
+
+
+@dataclass(frozen=True)
+class GraphCase:
+    """Seeded benchmark graph as integer edge arrays over nodes 0..n_nodes-1."""
+
+    family: str
+    n_nodes: int
+    sources: np.ndarray
+    targets: np.ndarray
+    weights: np.ndarray
+    source: int
+    target: int
+
+    @property
+    def n_edges(self) -> int:
+        return int(self.sources.shape[0])
+
+    def to_networkx(self) -> nx.DiGraph:
+        graph = nx.DiGraph()
+        graph.add_nodes_from(range(self.n_nodes))
+        graph.add_weighted_edges_from(zip(self.sources.tolist(), self.targets.tolist(), self.weights.tolist()))
+        return graph
+
+    def compile(self) -> CompiledDAG:
+        return compile_edge_arrays(range(self.n_nodes), self.sources, self.targets, self.weights)
+
+
+def _case(family: str, n_nodes: int, src: np.ndarray, dst: np.ndarray, rng: np.random.Generator) -> GraphCase:
+    _, first = np.unique(src.astype(np.int64) * n_nodes + dst, return_index=True)
+    first.sort()
+    src, dst = src[first], dst[first]
+    weights = rng.uniform(0.1, 2.0, size=src.shape[0])
+    return GraphCase(family, n_nodes, src.astype(np.int64), dst.astype(np.int64), weights, 0, n_nodes - 1)
+
+
+def layered_dag(n_edges: int, rng: np.random.Generator, degree: int = 4) -> GraphCase:
+    """Square-ish layered DAG: every node links to ``degree`` random nodes of the next layer."""
+    width = max(degree, int(np.sqrt(n_edges / degree)))
+    layers = max(2, n_edges // (width * degree))
+    layer_nodes = 1 + np.arange(layers * width).reshape(layers, width)
+    sink = layers * width + 1
+    src = [np.zeros(width, dtype=np.int64)]
+    dst = [layer_nodes[0]]
+    for k in range(layers - 1):
+        src.append(np.repeat(layer_nodes[k], degree))
+        dst.append(layer_nodes[k + 1][rng.integers(0, width, size=width * degree)])
+    src.append(layer_nodes[-1])
+    dst.append(np.full(width, sink))
+    return _case("layered", sink + 1, np.concatenate(src), np.concatenate(dst), rng)
+
+
+def random_dag(n_edges: int, rng: np.random.Generator, degree: int = 8) -> GraphCase:
+    """Random forward edges i < j over a backbone chain 0 -> 1 -> ... -> n-1."""
+    n = max(3, n_edges // degree)
+    chain = np.arange(n - 1)
+    extra = max(0, n_edges - (n - 1))
+    a = rng.integers(0, n, size=extra)
+    b = rng.integers(0, n, size=extra)
+    keep = a != b
+    lo, hi = np.minimum(a, b)[keep], np.maximum(a, b)[keep]
+    return _case("random_dag", n, np.concatenate([chain, lo]), np.concatenate([chain + 1, hi]), rng)
+
+
+def grid_dag(n_edges: int, rng: np.random.Generator) -> GraphCase:
+    """k x k grid with right and down edges from the top-left to the bottom-right corner."""
+    k = max(2, int(np.sqrt(n_edges / 2)) + 1)
+    ids = np.arange(k * k).reshape(k, k)
+    src = np.concatenate([ids[:, :-1].ravel(), ids[:-1, :].ravel()])
+    dst = np.concatenate([ids[:, 1:].ravel(), ids[1:, :].ravel()])
+    return _case("grid", k * k, src, dst, rng)
+
+
+def parallel_paths_dag(n_edges: int, rng: np.random.Generator) -> GraphCase:
+    """``build_parallel_dag``-style s -> m_i -> t with n_edges / 2 two-hop paths."""
+    n_paths = max(1, n_edges // 2)
+    mids = np.arange(1, n_paths + 1)
+    sink = n_paths + 1
+    src = np.concatenate([np.zeros(n_paths, dtype=np.int64), mids])
+    dst = np.concatenate([mids, np.full(n_paths, sink)])
+    return _case("parallel", sink + 1, src, dst, rng)
+
+
+FAMILIES: Dict[str, Callable[[int, np.random.Generator], GraphCase]] = {
+    "layered": layered_dag,
+    "random_dag": random_dag,
+    "grid": grid_dag,
+    "parallel": parallel_paths_dag,
+}
+
+
+def make_case(family: str, n_edges: int, seed: int = 0) -> GraphCase:
+    if family not in FAMILIES:
+        raise ValueError(f"unknown graph family {family!r}; expected one of {sorted(FAMILIES)}")
+    return FAMILIES[family](int(n_edges), np.random.default_rng(seed))
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional, Sequence
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+HEAVY = ("numpy", "networkx", "scipy.special", "scipy.sparse", "matplotlib")
+
+# Each measurement runs in a fresh interpreter, so nothing is already cached in
+# sys.modules. Lazy stand-ins (see src._lazy) never enter sys.modules, so a
+# module is listed as loaded only once it has really been imported.
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+loaded = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"seconds": elapsed, "loaded": loaded}}))
+"""
+
+
+def measure_import(module: str, repeat: int = 3) -> Dict[str, Any]:
+    """Best-of-``repeat`` import time of ``module`` in a fresh interpreter."""
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY)],
+            cwd=ROOT,
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        runs.append(json.loads(out.stdout))
+    return {"module": module, "seconds": min(r["seconds"] for r in runs), "loaded": runs[0]["loaded"]}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check that importing src stays under a startup budget.")
+    parser.add_argument("--modules", nargs="+", default=["src", "src.compiled", "src.entropy_regularized"])
+    parser.add_argument("--budget", type=float, default=0.5, help="seconds allowed per module import")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    over: List[str] = []
+    for module in args.modules:
+        row = measure_import(module, args.repeat)
+        print(f"{module:>28} {row['seconds'] * 1e3:8.1f}ms  loaded: {', '.join(row['loaded']) or '-'}")
+        if row["seconds"] > args.budget:
+            over.append(module)
+    for module in over:
+        print(f"OVER BUDGET {module}: more than {args.budget:g}s")
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import networkx as nx
+import numpy as np
+
+from benchmarks.graph_families import FAMILIES, GraphCase, make_case
+from src.bounds import compute_path_stats
+from src.classical_shortest_path import dag_shortest_path_values, shortest_path_cost
+from src.entropy_regularized import soft_shortest_path_dag, soft_values_compiled
+
+# Prepared input -> zero-argument callable that runs the engine once.
+Runner = Callable[[Any, GraphCase, Optional[float]], Callable[[], Any]]
+
+
+@dataclass(frozen=True)
+class Engine:
+    name: str
+    prepare: Callable[[GraphCase], Any]
+    run: Runner
+    uses_temperature: bool
+    max_edges: int
+
+
+def _networkx(case: GraphCase) -> nx.DiGraph:
+    return case.to_networkx()
+
+
+def _compiled(case: GraphCase) -> Any:
+    return case.compile()
+
+
+ENGINES: Dict[str, Engine] = {
+    "soft_shortest_path_dag": Engine(
+        "soft_shortest_path_dag",
+        _networkx,
+        lambda g, case, T: lambda: soft_shortest_path_dag(g, case.source, case.target, T),
+        True,
+        10**6,
+    ),
+    "soft_values_compiled": Engine(
+        "soft_values_compiled",
+        _compiled,
+        lambda c, case, T: lambda: soft_values_compiled(c, case.target, T),
+        True,
+        10**8,
+    ),
+    "shortest_path_cost": Engine(
+        "shortest_path_cost",
+        _networkx,
+        lambda g, case, T: lambda: shortest_path_cost(g, case.source, case.target),
+        False,
+        10**6,
+    ),
+    "dag_shortest_path_values": Engine(
+        "dag_shortest_path_values",
+        _compiled,
+        lambda c, case, T: lambda: dag_shortest_path_values(c, case.target),
+        False,
+        10**8,
+    ),
+    "compute_path_stats": Engine(
+        "compute_path_stats",
+        _networkx,
+        lambda g, case, T: lambda: compute_path_stats(g, case.source, case.target),
+        False,
+        10**6,
+    ),
+}
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> Tuple[float, int]:
+    """Return (best wall time over ``repeat`` runs, peak traced bytes of one extra run)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, int(peak)
+
+
+def run_suite(
+    families: Sequence[str],
+    sizes: Sequence[int],
+    engines: Sequence[str],
+    temperatures: Sequence[float],
+    repeat: int = 3,
+    seed: int = 0,
+) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    for family in families:
+        for size in sizes:
+            case = make_case(family, size, seed=seed)
+            prepared: Dict[Callable[[GraphCase], Any], Any] = {}
+            for name in engines:
+                engine = ENGINES[name]
+                if case.n_edges > engine.max_edges:
+                    continue
+                if engine.prepare not in prepared:
+                    prepared[engine.prepare] = engine.prepare(case)
+                for T in temperatures if engine.uses_temperature else [None]:
+                    wall, peak = measure(engine.run(prepared[engine.prepare], case, T), repeat)
+                    results.append(
+                        {
+                            "family": family,
+                            "size": int(size),
+                            "n_nodes": case.n_nodes,
+                            "n_edges": case.n_edges,
+                            "engine": name,
+                            "temperature": T,
+                            "wall_time": wall,
+                            "peak_memory_bytes": peak,
+                            "edges_per_second": case.n_edges / wall if wall > 0 else float("inf"),
+                        }
+                    )
+    return results
+
+
+def _key(row: Dict[str, Any]) -> Tuple[Any, ...]:
+    return row["family"], row["size"], row["engine"], row["temperature"]
+
+
+def compare(
+    current: Sequence[Dict[str, Any]],
+    baseline: Sequence[Dict[str, Any]],
+    threshold: float = 1.25,
+    min_time: float = 1e-3,
+) -> List[Dict[str, Any]]:
+    """Return rows whose wall time grew by more than ``threshold`` x the baseline.
+
+    Baseline times below ``min_time`` seconds are raised to it so timer noise on
+    tiny cases is not reported.
+    """
+    base = {_key(row): row for row in baseline}
+    regressions = []
+    for row in current:
+        old = base.get(_key(row))
+        if old is None:
+            continue
+        ratio = row["wall_time"] / max(old["wall_time"], min_time)
+        if ratio > threshold:
+            regressions.append({**row, "baseline_wall_time": old["wall_time"], "ratio": ratio})
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark soft/hard shortest-path engines.")
+    parser.add_argument("--families", nargs="+", default=sorted(FAMILIES), choices=sorted(FAMILIES))
+    parser.add_argument("--sizes", nargs="+", type=float, default=[1e2, 1e3, 1e4, 1e5], help="target edge counts (up to 1e7)")
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument("--temperatures", nargs="+", type=float, default=[0.1, 1.0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON results path")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag regressions against a saved results JSON")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio counted as a regression")
+    args = parser.parse_args(argv)
+
+    results = run_suite(
+        args.families,
+        [int(s) for s in args.sizes],
+        args.engines,
+        args.temperatures,
+        repeat=args.repeat,
+        seed=args.seed,
+    )
+    payload = {
+        "meta": {
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "networkx": nx.__version__,
+            "platform": platform.platform(),
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+
+    for row in results:
+        T = "-" if row["temperature"] is None else f"{row['temperature']:g}"
+        print(
+            f"{row['family']:>10} {row['n_edges']:>9} {row['engine']:>26} T={T:<5} "
+            f"{row['wall_time']:.4g}s {row['peak_memory_bytes'] / 2**20:.1f}MiB {row['edges_per_second']:.3g} e/s"
+        )
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for row in regressions:
+            print(f"REGRESSION {row['family']} {row['size']} {row['engine']} T={row['temperature']}: x{row['ratio']:.2f}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
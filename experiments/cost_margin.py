@@ -3,12 +3,14 @@ from __future__ import annotations
 import csv
 import os
 import random
+from functools import partial
+from typing import Tuple
 
-import matplotlib.pyplot as plt
 import networkx as nx
 import numpy as np
 
-from src.bounds import compute_path_stats, theorem_iii_1_upper_bound
+from experiments.parallel import map_sweep
+from src.bounds import compute_path_stats, theorem_iii_1_upper_bound_array
 from src.entropy_regularized import soft_shortest_path_dag
 
 
@@ -34,24 +36,26 @@ def build_two_path_dag(delta: float) -> nx.DiGraph:
     return graph
 
 
-def main() -> None:
+def margin_point(delta: float, temperature: float) -> Tuple[float, int]:
+    """Return (gap, N_sub) on the two-path DAG with margin ``delta``."""
+    graph = build_two_path_dag(float(delta))
+    stats = compute_path_stats(graph, "s", "t")
+    d_star = stats["d_star"]
+    n_sub = stats["n_sub"]
+
+    dT, _ = soft_shortest_path_dag(graph, "s", "t", temperature)
+    return d_star - dT, int(n_sub)
+
+
+def main(workers: int = 1, plot: bool = True) -> None:
     np.random.seed(0)
     random.seed(0)
     temps = 0.5
     deltas = np.linspace(0.05, 2.0, 40)
 
-    gaps = []
-    bounds = []
-
-    for delta in deltas:
-        graph = build_two_path_dag(float(delta))
-        stats = compute_path_stats(graph, "s", "t")
-        d_star = stats["d_star"]
-        n_sub = stats["n_sub"]
-
-        dT, _ = soft_shortest_path_dag(graph, "s", "t", temps)
-        gaps.append(d_star - dT)
-        bounds.append(theorem_iii_1_upper_bound(temps, int(n_sub), float(delta)))
+    points = map_sweep(partial(margin_point, temperature=temps), [float(d) for d in deltas], workers)
+    gaps = [gap for gap, _ in points]
+    bounds = theorem_iii_1_upper_bound_array(temps, [n_sub for _, n_sub in points], deltas)
 
     _write_csv(
         _results_path("cost_margin.csv"),
@@ -59,6 +63,11 @@ def main() -> None:
         [[float(d), float(g), float(b), float(temps)] for d, g, b in zip(deltas, gaps, bounds)],
     )
 
+    if not plot:
+        return
+
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(6, 4))
     plt.plot(deltas, gaps, label="d*(s) - d_T(s)")
     plt.plot(deltas, bounds, linestyle="--", label="Theorem III.1 bound")
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Sequence, Tuple
+
+import numpy as np
+
+
+def resolve_workers(workers: int) -> int:
+    """Return a concrete worker count; 0 or less means one per CPU."""
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+
+def _run_point(task: Tuple[Callable[[Any], Any], Any, np.random.SeedSequence]) -> Any:
+    fn, point, seed = task
+    state = seed.generate_state(2)
+    np.random.seed(int(state[0]))
+    random.seed(int(state[1]))
+    return fn(point)
+
+
+def map_sweep(
+    fn: Callable[[Any], Any],
+    points: Sequence[Any],
+    workers: int = 1,
+    seed: int = 0,
+) -> List[Any]:
+    """Evaluate ``fn`` on every sweep point and return results in point order.
+
+    Each point gets its own seed spawned from ``seed``, and NumPy / ``random``
+    are reseeded before it runs, so results do not depend on how points are
+    spread over the pool. ``fn`` must be a picklable module-level callable.
+    """
+    seeds = np.random.SeedSequence(seed).spawn(len(points))
+    tasks = [(fn, point, s) for point, s in zip(points, seeds)]
+    workers = min(resolve_workers(workers), max(len(tasks), 1))
+    if workers == 1:
+        return [_run_point(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_run_point, tasks, chunksize=max(1, len(tasks) // (4 * workers))))
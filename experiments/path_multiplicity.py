@@ -3,13 +3,14 @@ from __future__ import annotations
 import csv
 import os
 import random
-from typing import List
+from functools import partial
+from typing import List, Tuple
 
-import matplotlib.pyplot as plt
 import networkx as nx
 import numpy as np
 
-from src.bounds import compute_path_stats, theorem_iii_1_upper_bound
+from experiments.parallel import map_sweep
+from src.bounds import compute_path_stats, theorem_iii_1_upper_bound_array
 from src.entropy_regularized import soft_shortest_path_dag
 
 
@@ -37,25 +38,31 @@ def build_parallel_dag(n_paths: int, delta: float = 0.2) -> nx.DiGraph:
     return graph
 
 
-def main() -> None:
+def multiplicity_point(n_paths: int, temperature: float) -> Tuple[float, int, float]:
+    """Return (gap, N_sub, Delta) on the parallel DAG with ``n_paths`` paths."""
+    graph = build_parallel_dag(n_paths, delta=0.3)
+    stats = compute_path_stats(graph, "s", "t")
+    d_star = stats["d_star"]
+    delta = stats["delta"]
+    n_sub = stats["n_sub"]
+
+    dT, _ = soft_shortest_path_dag(graph, "s", "t", temperature)
+    return d_star - dT, n_sub, delta
+
+
+def main(workers: int = 1, plot: bool = True) -> None:
     np.random.seed(0)
     random.seed(0)
     temps = 0.5
     n_paths_list = list(range(2, 16))
 
-    gaps = []
-    bounds = []
-
-    for n_paths in n_paths_list:
-        graph = build_parallel_dag(n_paths, delta=0.3)
-        stats = compute_path_stats(graph, "s", "t")
-        d_star = stats["d_star"]
-        delta = stats["delta"]
-        n_sub = stats["n_sub"]
-
-        dT, _ = soft_shortest_path_dag(graph, "s", "t", temps)
-        gaps.append(d_star - dT)
-        bounds.append(theorem_iii_1_upper_bound(temps, n_sub, delta))
+    points = map_sweep(partial(multiplicity_point, temperature=temps), n_paths_list, workers)
+    gaps = [gap for gap, _, _ in points]
+    bounds = theorem_iii_1_upper_bound_array(
+        temps,
+        [n_sub for _, n_sub, _ in points],
+        [delta for _, _, delta in points],
+    )
 
     _write_csv(
         _results_path("path_multiplicity.csv"),
@@ -66,6 +73,11 @@ def main() -> None:
         ],
     )
 
+    if not plot:
+        return
+
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(6, 4))
     plt.plot(n_paths_list, gaps, marker="o", label="d*(s) - d_T(s)")
     plt.plot(n_paths_list, bounds, marker="s", linestyle="--", label="Theorem III.1 bound")
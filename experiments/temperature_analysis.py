@@ -3,15 +3,17 @@ from __future__ import annotations
 import csv
 import os
 import random
-from typing import List, Sequence
+from functools import partial
+from typing import Any, Callable, List, Sequence
 
-import matplotlib.pyplot as plt
 import networkx as nx
 import numpy as np
 
-from src.bounds import compute_path_stats, theorem_iii_1_upper_bound
-from src.classical_shortest_path import dijkstra_shortest_path, dijkstra_shortest_path_length
-from src.entropy_regularized import soft_shortest_path_dag
+from experiments.parallel import map_sweep, resolve_workers
+from src.bounds import compute_path_stats, theorem_iii_1_upper_bound_array
+from src.classical_shortest_path import dag_shortest_path_lengths
+from src.compiled import compile_dag
+from src.entropy_regularized import soft_gap_values, soft_shortest_path_dag, soft_shortest_path_temperatures
 from src.graph import load_dag_from_json
 
 
@@ -28,21 +30,43 @@ def _write_csv(path: str, header: Sequence[str], rows: List[Sequence[object]]) -
         writer.writerows(rows)
 
 
-def plot_gap_vs_temperature(graph: nx.DiGraph, source: str, target: str) -> None:
+def soft_values_chunk(temps: np.ndarray, graph: nx.DiGraph, source: Any, target: Any) -> np.ndarray:
+    """Return d_T(source) for one chunk of a temperature grid."""
+    dT, _ = soft_shortest_path_temperatures(graph, source, target, temps)
+    return dT
+
+
+def soft_gap_chunk(temps: np.ndarray, graph: nx.DiGraph, source: Any, target: Any) -> np.ndarray:
+    """Return d*(source) - d_T(source) for one chunk of temperatures, computed in slack space."""
+    compiled = compile_dag(graph)
+    s = compiled.node_id(source)
+    return np.array([soft_gap_values(compiled, target, T, cutoff=np.inf)[1][s] for T in temps])
+
+
+def temperature_sweep(
+    chunk_fn: Callable[..., np.ndarray],
+    graph: nx.DiGraph,
+    source: Any,
+    target: Any,
+    temps: np.ndarray,
+    workers: int,
+) -> np.ndarray:
+    """Evaluate ``chunk_fn`` over a temperature grid, split into one chunk per worker."""
+    chunks = np.array_split(temps, min(resolve_workers(workers), temps.size))
+    fn = partial(chunk_fn, graph=graph, source=source, target=target)
+    return np.concatenate(map_sweep(fn, chunks, workers))
+
+
+def plot_gap_vs_temperature(graph: nx.DiGraph, source: str, target: str, workers: int = 1, plot: bool = True) -> None:
     stats = compute_path_stats(graph, source, target)
     d_star = stats["d_star"]
     delta = stats["delta"]
     n_sub = stats["n_sub"]
 
     temps = np.logspace(-2, 1, 60)
-    gaps = []
-    bounds = []
-
-    for T in temps:
-        dT, _ = soft_shortest_path_dag(graph, source, target, T)
-        gap = d_star - dT
-        gaps.append(gap)
-        bounds.append(theorem_iii_1_upper_bound(T, n_sub, delta))
+    dT = temperature_sweep(soft_values_chunk, graph, source, target, temps, workers)
+    gaps = d_star - dT
+    bounds = theorem_iii_1_upper_bound_array(temps, n_sub, delta)
 
     _write_csv(
         _results_path("temperature_gap.csv"),
@@ -50,6 +74,11 @@ def plot_gap_vs_temperature(graph: nx.DiGraph, source: str, target: str) -> None
         [[float(T), float(g), float(b)] for T, g, b in zip(temps, gaps, bounds)],
     )
 
+    if not plot:
+        return
+
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(6, 4))
     plt.semilogy(temps, gaps, label="d*(s) - d_T(s)")
     plt.semilogy(temps, bounds, label="Theorem III.1 bound", linestyle="--")
@@ -62,15 +91,10 @@ def plot_gap_vs_temperature(graph: nx.DiGraph, source: str, target: str) -> None
     plt.savefig(_results_path("temperature_gap.png"))
 
 
-def plot_exponential_convergence(graph: nx.DiGraph, source: str, target: str) -> None:
-    stats = compute_path_stats(graph, source, target)
-    d_star = stats["d_star"]
-
+def plot_exponential_convergence(graph: nx.DiGraph, source: str, target: str, workers: int = 1, plot: bool = True) -> None:
+    # d* - d_T cancels to zero long before 1/T = 1000, so take the gap directly.
     temps = np.logspace(-3, -0.3, 60)
-    gaps = []
-    for T in temps:
-        dT, _ = soft_shortest_path_dag(graph, source, target, T)
-        gaps.append(d_star - dT)
+    gaps = temperature_sweep(soft_gap_chunk, graph, source, target, temps, workers)
 
     inv_t = 1.0 / temps
     _write_csv(
@@ -79,6 +103,11 @@ def plot_exponential_convergence(graph: nx.DiGraph, source: str, target: str) ->
         [[float(T), float(it), float(g)] for T, it, g in zip(temps, inv_t, gaps)],
     )
 
+    if not plot:
+        return
+
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(6, 4))
     plt.semilogy(inv_t, gaps)
     plt.xlabel("$1/T$")
@@ -89,15 +118,15 @@ def plot_exponential_convergence(graph: nx.DiGraph, source: str, target: str) ->
     plt.savefig(_results_path("exponential_convergence.png"))
 
 
-def plot_classical_vs_soft(graph: nx.DiGraph, source: str, target: str, temperature: float) -> None:
-    d_star = dijkstra_shortest_path_length(graph, source, target)
+def plot_classical_vs_soft(graph: nx.DiGraph, source: str, target: str, temperature: float, plot: bool = True) -> None:
+    d_star_all, _ = dag_shortest_path_lengths(graph, target)
+    d_star = d_star_all[source]
     dT, dT_all = soft_shortest_path_dag(graph, source, target, temperature)
 
-    pos = nx.spring_layout(graph, seed=7)
     labels = {}
     rows = []
     for node in graph.nodes:
-        hard = dijkstra_shortest_path_length(graph, node, target)
+        hard = d_star_all[node]
         soft = dT_all.get(node, float("inf"))
         labels[node] = f"{node}\n d*={hard:.2f}\n dT={soft:.2f}"
         rows.append([str(node), float(hard), float(soft)])
@@ -108,6 +137,12 @@ def plot_classical_vs_soft(graph: nx.DiGraph, source: str, target: str, temperat
         rows,
     )
 
+    if not plot:
+        return
+
+    import matplotlib.pyplot as plt
+
+    pos = nx.spring_layout(graph, seed=7)
     plt.figure(figsize=(7, 4.5))
     nx.draw_networkx(graph, pos=pos, node_color="#DDE7FF", node_size=900, labels=labels)
     edge_labels = {(u, v): f"{data.get('weight', 1.0):.2f}" for u, v, data in graph.edges(data=True)}
@@ -118,7 +153,7 @@ def plot_classical_vs_soft(graph: nx.DiGraph, source: str, target: str, temperat
     plt.savefig(_results_path("classical_vs_soft.png"))
 
 
-def main() -> None:
+def main(workers: int = 1, plot: bool = True) -> None:
     np.random.seed(0)
     random.seed(0)
     dag = load_dag_from_json(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data", "sample_dag.json")))
@@ -129,9 +164,9 @@ def main() -> None:
     if source is None or target is None:
         raise ValueError("sample_dag.json must define source and sink")
 
-    plot_gap_vs_temperature(graph, source, target)
-    plot_exponential_convergence(graph, source, target)
-    plot_classical_vs_soft(graph, source, target, temperature=0.5)
+    plot_gap_vs_temperature(graph, source, target, workers, plot=plot)
+    plot_exponential_convergence(graph, source, target, workers, plot=plot)
+    plot_classical_vs_soft(graph, source, target, temperature=0.5, plot=plot)
 
 
 if __name__ == "__main__":
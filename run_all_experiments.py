@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import argparse
 import csv
 import os
 from statistics import mean
-from typing import Dict, List, Sequence
+from typing import Dict, List, Optional, Sequence
 
 from experiments import cost_margin, path_multiplicity, temperature_analysis
 
@@ -48,12 +49,27 @@ def _print_summary(label: str, csv_file: str, columns: Sequence[str]) -> None:
         )
 
 
-def main() -> None:
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run all experiments and summarize their CSVs.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="process-pool size for sweep points (0 = one per CPU; default: 1, serial)",
+    )
+    parser.add_argument(
+        "--no-plot",
+        dest="plot",
+        action="store_false",
+        help="write the CSVs only; skips matplotlib entirely",
+    )
+    args = parser.parse_args(argv)
+
     os.makedirs(RESULTS_DIR, exist_ok=True)
 
-    temperature_analysis.main()
-    cost_margin.main()
-    path_multiplicity.main()
+    temperature_analysis.main(workers=args.workers, plot=args.plot)
+    cost_margin.main(workers=args.workers, plot=args.plot)
+    path_multiplicity.main(workers=args.workers, plot=args.plot)
 
     _print_summary(
         "Temperature analysis",
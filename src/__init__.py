@@ -1,5 +1,27 @@
-from .bounds import soft_hard_gap_bound
-from .classical_shortest_path import shortest_path_cost
-from .entropy_regularized import soft_shortest_path
+from __future__ import annotations
+
+from importlib import import_module
+from typing import Any, List
+
+# Public names resolve lazily (PEP 562), so ``import src`` loads no numerics
+# until one of them is used.
+_EXPORTS = {
+    "soft_shortest_path": ".entropy_regularized",
+    "shortest_path_cost": ".classical_shortest_path",
+    "soft_hard_gap_bound": ".bounds",
+}
 
 __all__ = ["soft_shortest_path", "shortest_path_cost", "soft_hard_gap_bound"]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
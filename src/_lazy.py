@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import sys
+import threading
+from types import ModuleType
+from typing import Any, Optional
+
+# Heavy third-party modules (networkx, scipy) are bound through lazy_module()
+# so that importing src stays cheap; the real import runs on first attribute
+# access, e.g. the first nx.DiGraph() or isinstance(graph, nx.DiGraph).
+
+
+class _LazyModule(ModuleType):
+    """Stand-in that imports the real module, once and under a lock, on first use.
+
+    Attribute lookups are forwarded rather than copied, so monkeypatching the
+    real module stays visible. Never placed in sys.modules.
+    """
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self._lazy_lock = threading.Lock()
+        self._lazy_module: Optional[ModuleType] = None
+
+    def _load(self) -> ModuleType:
+        module = self._lazy_module
+        if module is None:
+            with self._lazy_lock:
+                if self._lazy_module is None:
+                    self._lazy_module = importlib.import_module(self.__name__)
+                module = self._lazy_module
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __dir__(self) -> list:
+        return dir(self._load())
+
+
+def lazy_module(name: str) -> ModuleType:
+    """Return ``name`` as a module that is imported on first attribute access.
+
+    Already-imported modules are returned as is.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    if importlib.util.find_spec(name.partition(".")[0]) is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    return _LazyModule(name)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import json
+import struct
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .compiled import CompiledDAG, compile_edge_arrays
+
+MAGIC = b"DAGBIN01"
+_ALIGN = 64
+_WRITE_BLOCK = 1 << 20
+_ARRAYS = (("indptr", "<i8"), ("indices", "<i8"), ("weights", "<f8"), ("level_ptr", "<i8"))
+
+# Layout: MAGIC | uint64 header length | JSON header | 64-byte aligned arrays.
+# The header records array offsets, the source/sink and the node table; integer
+# node tables are stored as an extra "labels" array instead of JSON. Node ids in
+# the file are the CompiledDAG ids, so ids n-1..0 are a topological order and
+# level_ptr holds the precomputed height levels.
+
+
+def _check_labels(nodes: Sequence[Any]) -> bool:
+    """Return True when labels can be stored as an int64 array."""
+    if all(isinstance(node, (int, np.integer)) and not isinstance(node, bool) for node in nodes):
+        return True
+    for node in nodes:
+        if not isinstance(node, (str, int, float)):
+            raise ValueError(f"node label {node!r} cannot be stored in the binary format")
+    return False
+
+
+def write_binary_dag(
+    compiled: CompiledDAG,
+    path: str,
+    source: Optional[Any] = None,
+    sink: Optional[Any] = None,
+) -> None:
+    """Write a CompiledDAG (plus optional source/sink) to the binary format."""
+    int_labels = _check_labels(compiled.nodes)
+    arrays = [(name, np.ascontiguousarray(getattr(compiled, name), dtype=dtype)) for name, dtype in _ARRAYS]
+    if int_labels:
+        arrays.append(("labels", np.asarray(compiled.nodes, dtype="<i8")))
+
+    header: Dict[str, Any] = {
+        "version": 1,
+        "n_nodes": compiled.n_nodes,
+        "n_edges": compiled.n_edges,
+        "source": source,
+        "sink": sink,
+        "nodes": None if int_labels else list(compiled.nodes),
+        "arrays": {},
+    }
+    # Offsets depend on the header length, so size the header with placeholders first.
+    for name, array in arrays:
+        header["arrays"][name] = [0, int(array.shape[0]), array.dtype.str]
+    while True:
+        blob = json.dumps(header).encode("utf-8")
+        offset = -(-(len(MAGIC) + 8 + len(blob)) // _ALIGN) * _ALIGN
+        layout = {}
+        for name, array in arrays:
+            layout[name] = [offset, int(array.shape[0]), array.dtype.str]
+            offset += -(-array.nbytes // _ALIGN) * _ALIGN
+        if layout == header["arrays"]:
+            break
+        header["arrays"] = layout
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(blob)))
+        f.write(blob)
+        for name, array in arrays:
+            f.seek(header["arrays"][name][0])
+            # Copy in blocks so memory-mapped inputs are never materialized whole.
+            for start in range(0, array.shape[0], _WRITE_BLOCK):
+                f.write(array[start:start + _WRITE_BLOCK].tobytes())
+        f.truncate(offset)
+
+
+def read_binary_header(path: str) -> Dict[str, Any]:
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a binary DAG file")
+        (length,) = struct.unpack("<Q", f.read(8))
+        return json.loads(f.read(length).decode("utf-8"))
+
+
+def load_binary_dag(path: str, mmap: bool = True) -> Tuple[CompiledDAG, Optional[Any], Optional[Any]]:
+    """Load (compiled DAG, source, sink) from the binary format.
+
+    With ``mmap=True`` the CSR arrays are read-only memory maps of the file, so
+    loading is O(header) and the DP engines read the mapped arrays directly.
+    """
+    header = read_binary_header(path)
+    arrays: Dict[str, np.ndarray] = {}
+    for name, (offset, count, dtype) in header["arrays"].items():
+        if mmap and count:
+            arrays[name] = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(count,))
+        else:
+            arrays[name] = np.fromfile(path, dtype=dtype, count=count, offset=offset)
+            arrays[name].flags.writeable = False
+
+    nodes = arrays.pop("labels") if header["nodes"] is None else tuple(header["nodes"])
+    compiled = CompiledDAG(nodes=nodes, **arrays)
+    return compiled, header["source"], header["sink"]
+
+
+def convert_json_to_binary(json_path: str, out_path: str) -> CompiledDAG:
+    """Convert a JSON DAG (see load_dag_from_json) to the binary format without networkx."""
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    index: Dict[Any, int] = {}
+    for node in data.get("nodes", []):
+        index.setdefault(node, len(index))
+    edges = data.get("edges", [])
+    sources = np.empty(len(edges), dtype=np.int64)
+    targets = np.empty(len(edges), dtype=np.int64)
+    weights = np.empty(len(edges), dtype=np.float64)
+    for i, (u, v, w) in enumerate(edges):
+        sources[i] = index.setdefault(u, len(index))
+        targets[i] = index.setdefault(v, len(index))
+        weights[i] = w
+
+    compiled = compile_edge_arrays(list(index), sources, targets, weights)
+    write_binary_dag(compiled, out_path, source=data.get("source"), sink=data.get("sink"))
+    return compiled
@@ -1,9 +1,19 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List, Tuple
+import math
+from typing import Any, Dict, Iterable, List, Tuple, Union
 
-import networkx as nx
 import numpy as np
+from numpy.typing import ArrayLike
+
+from . import instrumentation
+from ._lazy import lazy_module
+from .compiled import CompiledDAG, compile_dag, segment_logsumexp
+from .graph import DAG, CompactDAG, resolve_dag
+
+nx = lazy_module("networkx")
+
+_MAX_FLOAT = float(np.finfo(np.float64).max)
 
 
 def theorem_iii_1_upper_bound(temperature: float, n_sub: int, delta: float) -> float:
@@ -14,10 +24,51 @@ def theorem_iii_1_upper_bound(temperature: float, n_sub: int, delta: float) -> f
         raise ValueError("n_sub must be non-negative")
     if delta < 0:
         raise ValueError("delta must be non-negative")
+    if n_sub > _MAX_FLOAT:
+        return theorem_iii_1_upper_bound_log(temperature, math.log(n_sub), delta)
 
     return float(temperature * np.log1p(n_sub * np.exp(-delta / temperature)))
 
 
+def theorem_iii_1_upper_bound_log(temperature: float, log_n_sub: float, delta: float) -> float:
+    """Overflow-safe Theorem III.1 bound taking log N_sub (``-inf`` when N_sub = 0)."""
+    return float(theorem_iii_1_upper_bound_array(temperature, log_n_sub, delta, log_count=True))
+
+
+def theorem_iii_1_upper_bound_array(
+    temperature: ArrayLike,
+    n_sub: ArrayLike,
+    delta: ArrayLike,
+    log_count: bool = False,
+) -> np.ndarray:
+    """Vectorized Theorem III.1 bound over broadcast arrays of (T, N_sub, Delta).
+
+    Evaluates ``T * logaddexp(0, log N_sub - Delta / T)``, which equals
+    ``T log(1 + N_sub e^{-Delta/T})`` without forming ``N_sub e^{-Delta/T}``.
+    With ``log_count=True`` the ``n_sub`` argument holds ``log N_sub`` (``-inf``
+    for zero), so counts beyond float range are fine. Validation matches
+    theorem_iii_1_upper_bound, applied elementwise.
+    """
+    temperature = np.asarray(temperature, dtype=np.float64)
+    n_sub = np.asarray(n_sub, dtype=np.float64)
+    delta = np.asarray(delta, dtype=np.float64)
+    if not (temperature > 0).all():
+        raise ValueError("temperature must be positive")
+    if log_count:
+        if np.isnan(n_sub).any() or (n_sub == np.inf).any():
+            raise ValueError("log n_sub must be finite or -inf")
+        log_n_sub = n_sub
+    else:
+        if not (n_sub >= 0).all():
+            raise ValueError("n_sub must be non-negative")
+        with np.errstate(divide="ignore"):
+            log_n_sub = np.log(n_sub)
+    if not (delta >= 0).all():
+        raise ValueError("delta must be non-negative")
+
+    return temperature * np.logaddexp(0.0, log_n_sub - delta / temperature)
+
+
 def soft_hard_gap_bound(delta: float, n_sub: int, temperature: float) -> float:
     """Return T log(1 + N_sub exp(-Delta/T)) for the soft-hard gap on a DAG.
 
@@ -34,25 +85,210 @@ def enumerate_path_costs(
     max_paths: int | None = None,
 ) -> List[float]:
     costs: List[float] = []
-    for i, path in enumerate(nx.all_simple_paths(graph, source, target)):
-        total = 0.0
-        for u, v in zip(path[:-1], path[1:]):
-            total += float(graph[u][v].get(weight, 1.0))
-        costs.append(total)
-        if max_paths is not None and i + 1 >= max_paths:
-            break
+    with instrumentation.phase("enumerate_path_costs"):
+        for i, path in enumerate(nx.all_simple_paths(graph, source, target)):
+            total = 0.0
+            for u, v in zip(path[:-1], path[1:]):
+                total += float(graph[u][v].get(weight, 1.0))
+            costs.append(total)
+            if max_paths is not None and i + 1 >= max_paths:
+                break
+    instrumentation.count("paths_enumerated", len(costs))
     return costs
 
 
+def _merge_cost(
+    best: Dict[Any, float] | List[float],
+    second: Dict[Any, float] | List[float],
+    n_opt: Dict[Any, int] | List[int],
+    node: Any,
+    cost: float,
+    count: int,
+) -> None:
+    if cost < best[node]:
+        if best[node] < float("inf"):
+            second[node] = best[node]
+        best[node] = cost
+        n_opt[node] = count
+    elif cost == best[node]:
+        n_opt[node] += count
+    elif cost < second[node]:
+        second[node] = cost
+
+
 def compute_path_stats(
+    graph: Union[DAG, nx.DiGraph],
+    source: Any,
+    target: Any,
+    weight: str = "weight",
+) -> Dict[str, float | int]:
+    """Compute d*, delta, N_tot, N_sub by forward topological DP (DAG).
+
+    Tracks, per node, the best and second-best distinct prefix cost, the exact
+    number of optimal prefixes and the total number of prefixes, so the cost is
+    linear in edges. Prefix costs are summed in path order, as in
+    compute_path_stats_enumeration, but only the two best prefixes per node are
+    kept: if adding an edge weight rounds two distinct prefix costs to the same
+    float, the counts can differ from enumeration. DAG wrappers reuse their
+    cached order; CompactDAG inputs run the same DP over the compiled CSR.
+    """
+    if isinstance(graph, CompactDAG):
+        if not graph.is_acyclic():
+            raise ValueError("compute_path_stats expects a DAG")
+        return _path_stats_compiled(graph.compile(), source, target)
+
+    with instrumentation.phase("compute_path_stats.validate"):
+        graph, topo = resolve_dag(graph, "compute_path_stats")
+
+    inf = float("inf")
+    best: Dict[Any, float] = {node: inf for node in graph.nodes}
+    second: Dict[Any, float] = dict(best)
+    n_opt: Dict[Any, int] = {node: 0 for node in graph.nodes}
+    n_all: Dict[Any, int] = dict(n_opt)
+    best[source] = 0.0
+    n_opt[source] = 1
+    n_all[source] = 1
+
+    with instrumentation.phase("compute_path_stats.dp"):
+        for u in topo:
+            if n_all[u] == 0 or u == target:
+                continue
+            for _, v, data in graph.out_edges(u, data=True):
+                w = float(data.get(weight, 1.0))
+                n_all[v] += n_all[u]
+                _merge_cost(best, second, n_opt, v, best[u] + w, n_opt[u])
+                if second[u] < inf:
+                    _merge_cost(best, second, n_opt, v, second[u] + w, 0)
+    if instrumentation.enabled():
+        instrumentation.count("nodes", len(topo))
+        instrumentation.count("edges", graph.number_of_edges())
+    return _path_stats_result(best[target], second[target], n_all[target], n_opt[target])
+
+
+def _path_stats_compiled(compiled: CompiledDAG, source: Any, target: Any) -> Dict[str, float | int]:
+    """compute_path_stats over the CSR arrays (ids n-1..0 are a topological order)."""
+    s = compiled.node_id(source)
+    t = compiled.node_id(target)
+    inf = float("inf")
+    n = compiled.n_nodes
+    best = [inf] * n
+    second = [inf] * n
+    n_opt = [0] * n
+    n_all = [0] * n
+    best[s] = 0.0
+    n_opt[s] = 1
+    n_all[s] = 1
+
+    indptr = compiled.indptr
+    with instrumentation.phase("compute_path_stats.dp"):
+        # Nodes with larger ids than s cannot be reached from it.
+        for u in range(s, -1, -1):
+            if n_all[u] == 0 or u == t:
+                continue
+            lo, hi = int(indptr[u]), int(indptr[u + 1])
+            for v, w in zip(compiled.indices[lo:hi].tolist(), compiled.weights[lo:hi].tolist()):
+                n_all[v] += n_all[u]
+                _merge_cost(best, second, n_opt, v, best[u] + w, n_opt[u])
+                if second[u] < inf:
+                    _merge_cost(best, second, n_opt, v, second[u] + w, 0)
+    return _path_stats_result(best[t], second[t], n_all[t], n_opt[t])
+
+
+def _path_stats_result(best: float, second: float, n_all: int, n_opt: int) -> Dict[str, float | int]:
+    if n_all == 0:
+        raise ValueError("No paths from source to target")
+
+    delta = second - best
+    n_sub = n_all - n_opt
+    if delta == float("inf"):
+        delta = 0.0
+        n_sub = 0
+
+    return {
+        "d_star": float(best),
+        "delta": float(delta),
+        "n_tot": int(n_all),
+        "n_sub": int(n_sub),
+    }
+
+
+def log_path_stats(
+    graph: Union[DAG, nx.DiGraph, CompiledDAG],
+    source: Any,
+    target: Any,
+    weight: str = "weight",
+) -> Dict[str, float]:
+    """Compute d*, delta, log N_tot, log N_opt and log N_sub by a backward level DP.
+
+    The compiled counterpart of compute_path_stats for graphs with too many
+    paths to count exactly: per node it tracks the best and second-best
+    distinct suffix cost and the log-counts of all, optimal and sub-optimal
+    suffixes. N_sub gets its own recursion (sub-optimal suffixes through an
+    optimal edge, plus every suffix through a non-optimal edge), so it never
+    suffers cancellation from log(N_tot - N_opt). Suffix costs are summed from
+    the target back, so ties are exact in that order. Linear in edges.
+    """
+    compiled = graph if isinstance(graph, CompiledDAG) else compile_dag(graph, weight=weight)
+    s = compiled.node_id(source)
+    t = compiled.node_id(target)
+    n = compiled.n_nodes
+    best = np.full(n, np.inf)
+    second = np.full(n, np.inf)
+    log_all = np.full(n, -np.inf)
+    log_opt = np.full(n, -np.inf)
+    log_sub = np.full(n, -np.inf)
+    best[t] = log_all[t] = log_opt[t] = 0.0
+
+    with instrumentation.phase("log_path_stats.dp"):
+        for level in range(1, compiled.n_levels):
+            lo, hi, e_lo, e_hi = compiled.level_bounds(level)
+            heads = compiled.indices[e_lo:e_hi]
+            w = compiled.weights[e_lo:e_hi]
+            starts = compiled.indptr[lo:hi] - e_lo
+            lengths = np.diff(compiled.indptr[lo:hi + 1])
+            cost = w + best[heads]
+            node_best = np.minimum.reduceat(cost, starts)
+            opt = (cost == np.repeat(node_best, lengths)) & np.isfinite(cost)
+            runner = np.where(opt, w + second[heads], cost)
+
+            best[lo:hi] = node_best
+            second[lo:hi] = np.minimum.reduceat(runner, starts)
+            log_all[lo:hi] = segment_logsumexp(log_all[heads], starts)
+            log_opt[lo:hi] = segment_logsumexp(np.where(opt, log_opt[heads], -np.inf), starts)
+            log_sub[lo:hi] = segment_logsumexp(np.where(opt, log_sub[heads], log_all[heads]), starts)
+            if lo <= t < hi:
+                best[t] = log_all[t] = log_opt[t] = 0.0
+                second[t] = np.inf
+                log_sub[t] = -np.inf
+
+    if not np.isfinite(log_all[s]):
+        raise ValueError("No paths from source to target")
+
+    delta = float(second[s] - best[s])
+    log_n_sub = float(log_sub[s])
+    if delta == np.inf:
+        delta = 0.0
+        log_n_sub = -np.inf
+
+    return {
+        "d_star": float(best[s]),
+        "delta": delta,
+        "log_n_tot": float(log_all[s]),
+        "log_n_opt": float(log_opt[s]),
+        "log_n_sub": log_n_sub,
+    }
+
+
+def compute_path_stats_enumeration(
     graph: nx.DiGraph,
     source: Any,
     target: Any,
     weight: str = "weight",
 ) -> Dict[str, float | int]:
-    """Compute d*, delta, N_tot, N_sub using full path enumeration (DAG)."""
-    if not nx.is_directed_acyclic_graph(graph):
-        raise ValueError("compute_path_stats expects a DAG")
+    """Reference d*, delta, N_tot, N_sub from full path enumeration (exponential; DAG)."""
+    with instrumentation.phase("compute_path_stats_enumeration.validate"):
+        if not nx.is_directed_acyclic_graph(graph):
+            raise ValueError("compute_path_stats_enumeration expects a DAG")
 
     costs = enumerate_path_costs(graph, source, target, weight=weight)
     if not costs:
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import sys
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ._lazy import lazy_module
+from .bounds import compute_path_stats
+from .compiled import CompiledDAG, compile_dag
+from .entropy_regularized import soft_values_compiled
+from .graph import DAG, CompactDAG
+
+nx = lazy_module("networkx")
+
+GraphLike = Union[DAG, "nx.DiGraph"]
+
+
+def graph_fingerprint(graph: GraphLike, weight: str = "weight") -> str:
+    """Hash of node labels, edge endpoints and edge weights (O(V + E), no sorting).
+
+    Insertion order is part of the fingerprint, so equal graphs built in a
+    different order get different keys (a miss, never a wrong hit).
+    """
+    if isinstance(graph, CompactDAG):
+        # Hashed from the edge columns, without building a networkx copy.
+        nodes = graph.nodes()
+        tails, heads, weights = graph.columns()
+        edges = [(nodes[u], nodes[v]) for u, v in zip(tails.tolist(), heads.tolist())]
+    else:
+        if isinstance(graph, DAG):
+            graph = graph.to_networkx()
+        nodes = list(graph.nodes)
+        edges = list(graph.edges)
+        weights = np.fromiter((w for _, _, w in graph.edges(data=weight, default=1.0)), dtype=np.float64)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{len(nodes)}:{len(edges)}:{weight}".encode())
+    h.update("\0".join(map(repr, nodes)).encode())
+    h.update("\0".join(f"{u!r}\1{v!r}" for u, v in edges).encode())
+    h.update(weights.tobytes())
+    return h.hexdigest()
+
+
+def _estimate_nbytes(value: Any) -> int:
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, CompiledDAG):
+        arrays = (value.indptr, value.indices, value.weights, value.level_ptr)
+        return sum(int(a.nbytes) for a in arrays) + 64 * value.n_nodes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_estimate_nbytes(k) + _estimate_nbytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_estimate_nbytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """LRU of computed results bounded by an estimated byte budget.
+
+    Keys are tuples ``(kind, fingerprint, ...)``. With ``directory`` set, entries
+    are also pickled there (write-through) and survive eviction and restarts.
+    DAG wrappers are fingerprinted once per mutation ``version``; when a wrapper
+    changes, entries for its previous fingerprint are dropped.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 2**20, directory: Optional[str] = None) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.max_bytes = int(max_bytes)
+        self.directory = directory
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._dag_fingerprints: "weakref.WeakKeyDictionary[DAG, Dict[str, Tuple[int, str]]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def fingerprint(self, graph: GraphLike, weight: str = "weight") -> str:
+        if not isinstance(graph, DAG):
+            return graph_fingerprint(graph, weight)
+        memo = self._dag_fingerprints.setdefault(graph, {})
+        seen = memo.get(weight)
+        if seen is not None and seen[0] == graph.version:
+            return seen[1]
+        fp = graph_fingerprint(graph, weight)
+        if seen is not None and seen[1] != fp:
+            self.invalidate(seen[1])
+        memo[weight] = (graph.version, fp)
+        return fp
+
+    def _disk_path(self, key: Hashable) -> str:
+        assert self.directory is not None
+        name = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+        return os.path.join(self.directory, f"{name}.pkl")
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        if self.directory is not None and os.path.exists(self._disk_path(key)):
+            with open(self._disk_path(key), "rb") as f:
+                stored_key, value = pickle.load(f)
+            if stored_key == key:
+                self.hits += 1
+                self._insert(key, value)
+                return value
+        self.misses += 1
+        return default
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.directory is not None:
+            with open(self._disk_path(key), "wb") as f:
+                pickle.dump((key, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._insert(key, value)
+
+    def _insert(self, key: Hashable, value: Any) -> None:
+        size = _estimate_nbytes(value)
+        if key in self._entries:
+            self.nbytes -= self._entries.pop(key)[1]
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (value, size)
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.nbytes -= evicted
+
+    def invalidate(self, fingerprint: str) -> int:
+        """Drop in-memory entries for one graph fingerprint; return how many."""
+        stale: List[Hashable] = [k for k in self._entries if isinstance(k, tuple) and k[1:2] == (fingerprint,)]
+        for key in stale:
+            self.nbytes -= self._entries.pop(key)[1]
+        return len(stale)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.nbytes = 0
+
+
+default_cache = ResultCache()
+
+
+def cached_compile(graph: GraphLike, weight: str = "weight", cache: Optional[ResultCache] = None) -> CompiledDAG:
+    """compile_dag with the result (topological order + CSR arrays) cached per fingerprint."""
+    cache = default_cache if cache is None else cache
+    return _compiled_for(graph, cache.fingerprint(graph, weight), weight, cache)
+
+
+def _compiled_for(graph: GraphLike, fingerprint: str, weight: str, cache: ResultCache) -> CompiledDAG:
+    key = ("compiled", fingerprint, weight)
+    compiled = cache.get(key)
+    if compiled is None:
+        compiled = compile_dag(graph, weight=weight)
+        cache.put(key, compiled)
+    return compiled
+
+
+def cached_topological_order(graph: GraphLike, cache: Optional[ResultCache] = None) -> List[Any]:
+    """Topological order (sources first) taken from the cached compiled graph."""
+    compiled = cached_compile(graph, cache=cache)
+    return [compiled.nodes[i] for i in compiled.topological_order()]
+
+
+def cached_soft_values(
+    graph: GraphLike,
+    target: Any,
+    temperature: float,
+    weight: str = "weight",
+    cache: Optional[ResultCache] = None,
+) -> Tuple[CompiledDAG, np.ndarray]:
+    """Return (compiled graph, d_T array in compiled order), cached per (graph, weight, target, T)."""
+    cache = default_cache if cache is None else cache
+    fingerprint = cache.fingerprint(graph, weight)
+    compiled = _compiled_for(graph, fingerprint, weight, cache)
+    key = ("dT", fingerprint, weight, target, float(temperature))
+    values = cache.get(key)
+    if values is None:
+        values = soft_values_compiled(compiled, target, temperature)
+        values.flags.writeable = False
+        cache.put(key, values)
+    return compiled, values
+
+
+def cached_soft_shortest_path(
+    graph: GraphLike,
+    source: Any,
+    target: Any,
+    temperature: float,
+    weight: str = "weight",
+    cache: Optional[ResultCache] = None,
+) -> Tuple[float, Dict[Any, float]]:
+    """Cached counterpart of soft_shortest_path with the same return value."""
+    compiled, values = cached_soft_values(graph, target, temperature, weight, cache)
+    return float(values[compiled.node_id(source)]), compiled.to_dict(values)
+
+
+def cached_compute_path_stats(
+    graph: GraphLike,
+    source: Any,
+    target: Any,
+    weight: str = "weight",
+    cache: Optional[ResultCache] = None,
+) -> Dict[str, float | int]:
+    """Cached counterpart of compute_path_stats (returns a fresh dict per call)."""
+    cache = default_cache if cache is None else cache
+    key = ("stats", cache.fingerprint(graph, weight), weight, source, target)
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_path_stats(graph, source, target, weight=weight)
+        cache.put(key, stats)
+    return dict(stats)
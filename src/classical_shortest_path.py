@@ -1,8 +1,14 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
-import networkx as nx
+import numpy as np
+
+from . import instrumentation
+from ._lazy import lazy_module
+from .compiled import CompiledDAG, backward_sweep, compile_dag
+
+nx = lazy_module("networkx")
 
 
 def dijkstra_shortest_path_length(
@@ -41,6 +47,73 @@ def bellman_ford_shortest_path(
     return list(nx.bellman_ford_path(graph, source, target, weight=weight))
 
 
+def dag_shortest_path_values(compiled: CompiledDAG, target: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (d*(v), next-hop id) for every compiled node in one level sweep.
+
+    Linear in edges and valid for negative costs. The next hop of ``v`` is the
+    head of its first minimizing out-edge, or -1 when ``v`` is the target or
+    cannot reach it.
+    """
+    t = compiled.node_id(target)
+    values = np.full(compiled.n_nodes, np.inf)
+    values[t] = 0.0
+    next_hop = np.full(compiled.n_nodes, -1, dtype=np.int64)
+
+    with instrumentation.phase("dag_shortest_path_values"):
+        for level in range(1, compiled.n_levels):
+            lo, hi, e_lo, e_hi = compiled.level_bounds(level)
+            heads = compiled.indices[e_lo:e_hi]
+            costs = compiled.weights[e_lo:e_hi] + values[heads]
+            starts = compiled.indptr[lo:hi] - e_lo
+            best = np.minimum.reduceat(costs, starts)
+            lengths = np.diff(compiled.indptr[lo:hi + 1])
+            candidates = np.where(costs == np.repeat(best, lengths), np.arange(costs.shape[0]), costs.shape[0])
+            first = np.minimum.reduceat(candidates, starts)
+            values[lo:hi] = best
+            next_hop[lo:hi] = np.where(np.isfinite(best), heads[np.minimum(first, costs.shape[0] - 1)], -1)
+            if lo <= t < hi:
+                values[t] = 0.0
+                next_hop[t] = -1
+    if instrumentation.enabled():
+        instrumentation.count("nodes", compiled.n_nodes)
+        instrumentation.count("edges", compiled.n_edges)
+
+    return values, next_hop
+
+
+def dag_shortest_path_lengths(
+    graph: nx.DiGraph,
+    target: Any,
+    weight: str = "weight",
+) -> Tuple[Dict[Any, float], Dict[Any, Any]]:
+    """Return ({v: d*(v)}, {v: next hop toward target}) for all nodes of a DAG.
+
+    Nodes that cannot reach the target get +inf and no next-hop entry.
+    """
+    compiled = compile_dag(graph, weight=weight)
+    values, next_hop = dag_shortest_path_values(compiled, target)
+    nodes = compiled.nodes
+    return compiled.to_dict(values), {nodes[i]: nodes[j] for i, j in enumerate(next_hop) if j >= 0}
+
+
+def dag_shortest_path(
+    graph: nx.DiGraph,
+    source: Any,
+    target: Any,
+    weight: str = "weight",
+) -> List[Any]:
+    """Return a minimum-cost source->target node list on a DAG (negative costs allowed)."""
+    if source not in graph:
+        raise nx.NodeNotFound(f"Node {source} not found in graph")
+    _, next_hop = dag_shortest_path_lengths(graph, target, weight=weight)
+    if source != target and source not in next_hop:
+        raise nx.NetworkXNoPath(f"Node {target} not reachable from {source}")
+    path = [source]
+    while path[-1] != target:
+        path.append(next_hop[path[-1]])
+    return path
+
+
 def shortest_path_cost(
     graph: nx.DiGraph,
     source: Any,
@@ -49,6 +122,54 @@ def shortest_path_cost(
 ) -> float:
     """Return d*(source) = min_{pi: s->t} C(pi) on a DAG with temperature-free costs.
 
-    Assumes a DAG (and nonnegative edge weights); returns the classical shortest-path cost.
+    Assumes a DAG; uses one topological-order relaxation, so negative edge
+    weights are allowed. Returns the classical shortest-path cost.
     """
-    return dijkstra_shortest_path_length(graph, source, target, weight=weight)
+    for node in (source, target):
+        if node not in graph:
+            raise nx.NodeNotFound(f"Node {node} not found in graph")
+    compiled = compile_dag(graph, weight=weight)
+    values, _ = dag_shortest_path_values(compiled, target)
+    cost = float(values[compiled.node_id(source)])
+    if cost == float("inf"):
+        raise nx.NetworkXNoPath(f"Node {target} not reachable from {source}")
+    return cost
+
+
+def _segment_min(costs: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    return np.minimum.reduceat(costs, starts, axis=-1)
+
+
+def iter_shortest_path_value_blocks(
+    compiled: CompiledDAG,
+    targets: Sequence[Any],
+    block_size: int = 256,
+    max_block_edges: Optional[int] = None,
+) -> Iterator[Tuple[List[Any], np.ndarray]]:
+    """Yield (target block, (n_nodes, block) matrix of d*(v, t)) for many sinks.
+
+    Rows follow compiled node ids; unreachable pairs are +inf.
+    ``max_block_edges`` bounds the edges gathered at once (see backward_sweep).
+    """
+    if block_size <= 0:
+        raise ValueError("block_size must be positive")
+    targets = list(targets)
+    for start in range(0, len(targets), block_size):
+        block = targets[start:start + block_size]
+        ids = np.fromiter((compiled.node_id(t) for t in block), dtype=np.int64, count=len(block))
+        yield block, backward_sweep(compiled, ids, _segment_min, max_block_edges=max_block_edges).T
+
+
+def shortest_path_values_targets(
+    compiled: CompiledDAG,
+    targets: Sequence[Any],
+    block_size: int = 256,
+    max_block_edges: Optional[int] = None,
+) -> np.ndarray:
+    """Return the dense (n_nodes, n_targets) matrix of d*(v, t) for the given sinks."""
+    out = np.empty((compiled.n_nodes, len(targets)))
+    col = 0
+    for block, values in iter_shortest_path_value_blocks(compiled, targets, block_size, max_block_edges):
+        out[:, col:col + len(block)] = values
+        col += len(block)
+    return out
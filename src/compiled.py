@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from . import instrumentation
+from ._lazy import lazy_module
+from .graph import DAG, CompactDAG
+
+nx = lazy_module("networkx")
+
+
+@dataclass(frozen=True)
+class CompiledDAG:
+    """Immutable CSR form of a DAG.
+
+    Nodes are renumbered by height (longest edge count to any sink), so ids
+    ``level_ptr[k]:level_ptr[k + 1]`` form level ``k`` and every edge points from
+    a higher id to a lower one. Out-edges of node ``i`` are
+    ``indices[indptr[i]:indptr[i + 1]]`` with costs ``weights[...]``. ``nodes``
+    maps ids back to labels (a tuple, or an integer array for mapped files).
+    """
+
+    nodes: Sequence[Any]
+    indptr: np.ndarray
+    indices: np.ndarray
+    weights: np.ndarray
+    level_ptr: np.ndarray
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def n_edges(self) -> int:
+        return int(self.indices.shape[0])
+
+    @property
+    def n_levels(self) -> int:
+        return int(self.level_ptr.shape[0]) - 1
+
+    @cached_property
+    def index(self) -> Dict[Any, int]:
+        return {node: i for i, node in enumerate(self.nodes)}
+
+    def node_id(self, node: Any) -> int:
+        try:
+            return self.index[node]
+        except KeyError:
+            raise ValueError(f"node {node!r} is not in the graph") from None
+
+    def topological_order(self) -> np.ndarray:
+        """Return node ids in topological order (sources first)."""
+        return np.arange(self.n_nodes - 1, -1, -1, dtype=np.int64)
+
+    def level_bounds(self, level: int) -> Tuple[int, int, int, int]:
+        """Return (node_lo, node_hi, edge_lo, edge_hi) for one height level."""
+        lo = int(self.level_ptr[level])
+        hi = int(self.level_ptr[level + 1])
+        return lo, hi, int(self.indptr[lo]), int(self.indptr[hi])
+
+    def to_dict(self, values: np.ndarray) -> Dict[Any, float]:
+        """Map a per-node value array back to a {node: value} dict."""
+        return {node: float(x) for node, x in zip(self.nodes, values)}
+
+
+def _readonly(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+
+def concat_ranges(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Return the concatenation of ``arange(s, e)`` for each (s, e) pair."""
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    offsets = np.cumsum(lengths) - lengths
+    return np.repeat(starts - offsets, lengths) + np.arange(total, dtype=np.int64)
+
+
+def node_heights(n_nodes: int, sources: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """Longest edge count from each node to a sink, via level-synchronous Kahn."""
+    rev_order = np.argsort(targets, kind="stable")
+    rev_ptr = np.zeros(n_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(targets, minlength=n_nodes), out=rev_ptr[1:])
+    return kahn_heights(np.bincount(sources, minlength=n_nodes), rev_ptr, sources[rev_order])
+
+
+def kahn_heights(
+    out_degree: np.ndarray,
+    rev_ptr: np.ndarray,
+    rev_src: np.ndarray,
+    max_block_edges: Optional[int] = None,
+) -> np.ndarray:
+    """Heights from out-degrees and a reverse CSR (predecessors of ``v`` are
+    ``rev_src[rev_ptr[v]:rev_ptr[v + 1]]``).
+
+    ``rev_src`` may be a memory map; with ``max_block_edges`` each frontier is
+    expanded in pieces reading at most that many predecessor entries at once.
+    """
+    n_nodes = out_degree.shape[0]
+    remaining = np.array(out_degree, dtype=np.int64)
+    height = np.full(n_nodes, -1, dtype=np.int64)
+    frontier = np.flatnonzero(remaining == 0)
+    level = 0
+    while frontier.size:
+        height[frontier] = level
+        pieces = [frontier]
+        if max_block_edges is not None:
+            reads = np.cumsum(rev_ptr[frontier + 1] - rev_ptr[frontier])
+            cuts = np.searchsorted(reads, np.arange(max_block_edges, int(reads[-1]), max_block_edges), side="right")
+            pieces = np.split(frontier, np.unique(cuts))
+        ready = []
+        for piece in pieces:
+            preds = np.asarray(rev_src[concat_ranges(rev_ptr[piece], rev_ptr[piece + 1])])
+            uniq, counts = np.unique(preds, return_counts=True)
+            remaining[uniq] -= counts
+            ready.append(uniq[remaining[uniq] == 0])
+        frontier = np.unique(np.concatenate(ready))
+        level += 1
+
+    if (height < 0).any():
+        raise ValueError("Graph must be a DAG.")
+    return height
+
+
+def compile_edge_arrays(
+    nodes: Sequence[Any],
+    sources: np.ndarray,
+    targets: np.ndarray,
+    weights: np.ndarray,
+) -> CompiledDAG:
+    """Build a CompiledDAG from integer edge arrays indexing into ``nodes``.
+
+    Repeated (u, v) pairs keep the last weight, matching ``nx.DiGraph.add_edge``.
+    """
+    n = len(nodes)
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    weights = np.asarray(weights, dtype=np.float64)
+
+    with instrumentation.phase("compile.heights"):
+        height = node_heights(n, sources, targets)
+    perm = np.argsort(height, kind="stable")
+    rank = np.empty(n, dtype=np.int64)
+    rank[perm] = np.arange(n, dtype=np.int64)
+
+    src = rank[sources]
+    dst = rank[targets]
+    order = np.lexsort((dst, src))
+    src, dst, w = src[order], dst[order], weights[order]
+    if src.size:
+        last = np.ones(src.size, dtype=bool)
+        last[:-1] = (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])
+        src, dst, w = src[last], dst[last], w[last]
+
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    level_ptr = np.zeros(int(height.max(initial=-1)) + 2, dtype=np.int64)
+    np.cumsum(np.bincount(height, minlength=level_ptr.shape[0] - 1), out=level_ptr[1:])
+
+    return CompiledDAG(
+        nodes=tuple(nodes[i] for i in perm),
+        indptr=_readonly(indptr),
+        indices=_readonly(np.ascontiguousarray(dst)),
+        weights=_readonly(np.ascontiguousarray(w)),
+        level_ptr=_readonly(level_ptr),
+    )
+
+
+def compile_dag(graph: Union[DAG, nx.DiGraph], weight: str = "weight") -> CompiledDAG:
+    """Compile a DAG wrapper or networkx DiGraph (missing weights default to 1.0)."""
+    if isinstance(graph, CompactDAG):
+        return graph.compile()
+    if isinstance(graph, DAG):
+        graph = graph.to_networkx()
+    with instrumentation.phase("compile_dag.gather"):
+        nodes = list(graph.nodes)
+        index = {node: i for i, node in enumerate(nodes)}
+        m = graph.number_of_edges()
+        sources = np.empty(m, dtype=np.int64)
+        targets = np.empty(m, dtype=np.int64)
+        weights = np.empty(m, dtype=np.float64)
+        for i, (u, v, w) in enumerate(graph.edges(data=weight, default=1.0)):
+            sources[i] = index[u]
+            targets[i] = index[v]
+            weights[i] = w
+    return compile_edge_arrays(nodes, sources, targets, weights)
+
+
+def segment_logsumexp(terms: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Stable log-sum-exp of each non-empty segment ``terms[starts[i]:starts[i + 1]]``.
+
+    Segments run along the last axis; all-``-inf`` segments give ``-inf``.
+    """
+    instrumentation.count("logsumexp_calls")
+    m = np.maximum.reduceat(terms, starts, axis=-1)
+    shift = np.where(np.isfinite(m), m, 0.0)
+    lengths = np.diff(np.append(starts, terms.shape[-1]))
+    s = np.add.reduceat(np.exp(terms - np.repeat(shift, lengths, axis=-1)), starts, axis=-1)
+    with np.errstate(divide="ignore"):
+        return shift + np.log(s)
+
+
+def _sweep_block(
+    compiled: CompiledDAG,
+    values: np.ndarray,
+    lo: int,
+    hi: int,
+    combine: Callable[[np.ndarray, np.ndarray], np.ndarray],
+) -> None:
+    e_lo, e_hi = int(compiled.indptr[lo]), int(compiled.indptr[hi])
+    costs = compiled.weights[e_lo:e_hi] + values[:, compiled.indices[e_lo:e_hi]]
+    values[:, lo:hi] = combine(costs, compiled.indptr[lo:hi] - e_lo)
+
+
+def _level_chunks(compiled: CompiledDAG, lo: int, hi: int, n_chunks: int) -> np.ndarray:
+    """Split nodes lo:hi into at most ``n_chunks`` runs with about equal edge counts."""
+    e_lo, e_hi = compiled.indptr[lo], compiled.indptr[hi]
+    cuts = e_lo + (e_hi - e_lo) * np.arange(1, n_chunks) // n_chunks
+    inner = lo + np.searchsorted(compiled.indptr[lo:hi + 1], cuts)
+    return np.unique(np.concatenate(([lo], inner, [hi])))
+
+
+def backward_sweep(
+    compiled: CompiledDAG,
+    target_ids: np.ndarray,
+    combine: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    executor: Optional[Executor] = None,
+    n_chunks: int = 1,
+    min_chunk_edges: int = 1 << 16,
+    max_block_edges: Optional[int] = None,
+) -> np.ndarray:
+    """Run a (batch, n_nodes) backward DP over height levels.
+
+    Row ``j`` starts at +inf except ``target_ids[j]``, which is pinned to 0.
+    ``combine(costs, starts)`` turns per-edge costs ``w + value(head)`` of one
+    level, shape (batch, level_edges), into per-node values along segments
+    ``starts``.
+
+    Nodes of one level only read lower levels, so with an ``executor`` each
+    level with enough edges is split into up to ``n_chunks`` node runs that are
+    combined concurrently. Segments never straddle runs, so the result is
+    bit-identical to the serial sweep. ``max_block_edges`` likewise caps the
+    edges gathered per block (a single node's out-edges are never split), which
+    bounds working memory to ``batch * max_block_edges`` costs for graphs whose
+    levels are too wide to materialize at once.
+    """
+    target_ids = np.asarray(target_ids, dtype=np.int64)
+    rows = np.arange(target_ids.shape[0])
+    values = np.full((target_ids.shape[0], compiled.n_nodes), np.inf)
+    values[rows, target_ids] = 0.0
+    target_level = np.searchsorted(compiled.level_ptr, target_ids, side="right") - 1
+    if instrumentation.enabled():
+        instrumentation.count("nodes", compiled.n_nodes * target_ids.shape[0])
+        instrumentation.count("edges", compiled.n_edges * target_ids.shape[0])
+
+    with instrumentation.phase("backward_sweep"):
+        for level in range(1, compiled.n_levels):
+            lo, hi, e_lo, e_hi = compiled.level_bounds(level)
+            chunks = 1 if executor is None else min(n_chunks, (e_hi - e_lo) // max(min_chunk_edges, 1))
+            if max_block_edges is not None:
+                chunks = max(chunks, -(-(e_hi - e_lo) // max_block_edges))
+            if chunks < 2:
+                _sweep_block(compiled, values, lo, hi, combine)
+            elif executor is None:
+                bounds = _level_chunks(compiled, lo, hi, chunks)
+                for a, b in zip(bounds[:-1], bounds[1:]):
+                    _sweep_block(compiled, values, int(a), int(b), combine)
+            else:
+                bounds = _level_chunks(compiled, lo, hi, chunks)
+                futures = [
+                    executor.submit(_sweep_block, compiled, values, int(a), int(b), combine)
+                    for a, b in zip(bounds[:-1], bounds[1:])
+                ]
+                for future in futures:
+                    future.result()
+            pinned = target_level == level
+            values[rows[pinned], target_ids[pinned]] = 0.0
+
+    return values
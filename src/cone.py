@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple, Union
+
+import numpy as np
+
+from . import instrumentation
+from ._lazy import lazy_module
+from .classical_shortest_path import dag_shortest_path_values
+from .compiled import CompiledDAG, compile_edge_arrays, concat_ranges
+from .entropy_regularized import soft_values_temperatures
+from .graph import DAG, CompactDAG
+
+nx = lazy_module("networkx")
+
+
+def forward_reachable(compiled: CompiledDAG, source_id: int) -> np.ndarray:
+    """Boolean mask of node ids reachable from ``source_id`` (frontier BFS over CSR)."""
+    seen = np.zeros(compiled.n_nodes, dtype=bool)
+    seen[source_id] = True
+    frontier = np.array([source_id], dtype=np.int64)
+    while frontier.size:
+        heads = compiled.indices[concat_ranges(compiled.indptr[frontier], compiled.indptr[frontier + 1])]
+        frontier = np.unique(heads[~seen[heads]])
+        seen[frontier] = True
+    return seen
+
+
+def backward_reachable(compiled: CompiledDAG, target_id: int) -> np.ndarray:
+    """Boolean mask of node ids that can reach ``target_id`` (one sweep over levels)."""
+    reach = np.zeros(compiled.n_nodes, dtype=bool)
+    reach[target_id] = True
+    for level in range(1, compiled.n_levels):
+        lo, hi, e_lo, e_hi = compiled.level_bounds(level)
+        reach[lo:hi] |= np.logical_or.reduceat(reach[compiled.indices[e_lo:e_hi]], compiled.indptr[lo:hi] - e_lo)
+    return reach
+
+
+def st_cone(compiled: CompiledDAG, source: Any, target: Any) -> CompiledDAG:
+    """Return the sub-DAG of nodes lying on some source-to-target path.
+
+    The cone is forward-reachable from ``source`` intersected with
+    backward-reachable from ``target``; both endpoints are always kept, so an
+    unreachable target gives a two-node, edge-free cone. Every path from a cone
+    node to ``target`` stays inside the cone, so d*(v) and d_T(v) are unchanged
+    there.
+    """
+    s = compiled.node_id(source)
+    t = compiled.node_id(target)
+    with instrumentation.phase("st_cone.reachability"):
+        keep = forward_reachable(compiled, s) & backward_reachable(compiled, t)
+    keep[[s, t]] = True
+
+    tails = np.repeat(np.arange(compiled.n_nodes, dtype=np.int64), np.diff(compiled.indptr))
+    edges = keep[tails] & keep[compiled.indices]
+    ids = np.flatnonzero(keep)
+    local = np.full(compiled.n_nodes, -1, dtype=np.int64)
+    local[ids] = np.arange(ids.shape[0], dtype=np.int64)
+    return compile_edge_arrays(
+        [compiled.nodes[i] for i in ids],
+        local[tails[edges]],
+        local[compiled.indices[edges]],
+        compiled.weights[edges],
+    )
+
+
+def _networkx_cone(graph: nx.DiGraph, source: Any, target: Any, weight: str) -> CompiledDAG:
+    """st_cone for a networkx graph, compiling only the cone's edges.
+
+    Descendants of ``source`` are found first, then a reverse BFS from
+    ``target`` within them, so edges outside the cone are never visited by the
+    compile step.
+    """
+    for node in (source, target):
+        if node not in graph:
+            raise ValueError(f"node {node!r} is not in the graph")
+    with instrumentation.phase("st_cone.reachability"):
+        forward = nx.descendants(graph, source)
+        forward.add(source)
+        keep = {source: None, target: None}
+        if target in forward:
+            stack = [target]
+            while stack:
+                v = stack.pop()
+                for u in graph.predecessors(v):
+                    if u in forward and u not in keep:
+                        keep[u] = None
+                        stack.append(u)
+
+    nodes = list(keep)
+    index = {node: i for i, node in enumerate(nodes)}
+    sources: List[int] = []
+    targets: List[int] = []
+    weights: List[float] = []
+    for node in nodes:
+        for _, head, w in graph.out_edges(node, data=weight, default=1.0):
+            if head in index:
+                sources.append(index[node])
+                targets.append(index[head])
+                weights.append(w)
+    return compile_edge_arrays(nodes, np.array(sources, dtype=np.int64), np.array(targets, dtype=np.int64), weights)
+
+
+class ConeQuery:
+    """Point queries between a fixed source and target, run on their s-t cone only.
+
+    The cone is extracted once; every temperature (and the hard DP) then sweeps
+    only the cone's nodes and edges. networkx and DAG inputs are pruned before
+    compiling, so a point query never compiles the whole graph; callers holding
+    a CompiledDAG get the cone cut from its CSR.
+    """
+
+    def __init__(
+        self,
+        graph: Union[DAG, nx.DiGraph, CompiledDAG],
+        source: Any,
+        target: Any,
+        weight: str = "weight",
+    ) -> None:
+        self.source = source
+        self.target = target
+        if isinstance(graph, CompiledDAG):
+            self.cone = st_cone(graph, source, target)
+        elif isinstance(graph, CompactDAG):
+            self.cone = st_cone(graph.compile(), source, target)
+        else:
+            self.cone = _networkx_cone(graph.graph if isinstance(graph, DAG) else graph, source, target, weight)
+        self._s = self.cone.node_id(source)
+
+    @property
+    def reachable(self) -> bool:
+        return self.cone.n_edges > 0 or self.source == self.target
+
+    def soft_values(self, temperature: float) -> Dict[Any, float]:
+        """d_T(v) for every cone node."""
+        return self.cone.to_dict(soft_values_temperatures(self.cone, self.target, np.array([temperature]))[0])
+
+    def soft_value(self, temperature: float) -> float:
+        return float(self.soft_value_temperatures(np.array([temperature]))[0])
+
+    def soft_value_temperatures(self, temperatures: np.ndarray) -> np.ndarray:
+        """d_T(source) for each temperature, in one batched sweep over the cone."""
+        return soft_values_temperatures(self.cone, self.target, np.asarray(temperatures, dtype=np.float64))[:, self._s]
+
+    def hard_value(self) -> float:
+        values, _ = dag_shortest_path_values(self.cone, self.target)
+        return float(values[self._s])
+
+
+def soft_shortest_path_pruned(
+    graph: Union[DAG, nx.DiGraph],
+    source: Any,
+    target: Any,
+    temperature: float,
+    weight: str = "weight",
+) -> Tuple[float, Dict[Any, float]]:
+    """Like soft_shortest_path_dag, but the value dict covers only the s-t cone."""
+    query = ConeQuery(graph, source, target, weight=weight)
+    values = query.soft_values(temperature)
+    return values[source], values
@@ -1,62 +1,83 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Tuple
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
-import networkx as nx
 import numpy as np
-from scipy.special import logsumexp
+
+from . import instrumentation
+from ._lazy import lazy_module
+from .compiled import CompiledDAG, backward_sweep, compile_dag, segment_logsumexp
+from .graph import DAG, CompactDAG, resolve_dag
+
+nx = lazy_module("networkx")
+special = lazy_module("scipy.special")
 
 
 def soft_shortest_path_dag(
-    graph: nx.DiGraph,
+    graph: Union[DAG, nx.DiGraph],
     source: Any,
     target: Any,
     temperature: float,
     weight: str = "weight",
 ) -> Tuple[float, Dict[Any, float]]:
-    """Compute soft shortest-path values on a DAG using log-sum-exp (equation 3)."""
+    """Compute soft shortest-path values on a DAG using log-sum-exp (equation 3).
+
+    Acyclicity is checked by the topological sort itself; DAG wrappers reuse
+    their cached order, and CompactDAG inputs run the compiled level DP.
+    """
     if temperature <= 0:
         raise ValueError("temperature must be positive")
+    if isinstance(graph, CompactDAG):
+        # Answered on the compiled CSR; no networkx copy is built.
+        if not graph.is_acyclic():
+            raise ValueError("soft_shortest_path_dag expects a DAG")
+        compiled = graph.compile()
+        values = soft_values_compiled(compiled, target, temperature)
+        return float(values[compiled.node_id(source)]), compiled.to_dict(values)
 
-    if not nx.is_directed_acyclic_graph(graph):
-        raise ValueError("soft_shortest_path_dag expects a DAG")
-    assert nx.is_directed_acyclic_graph(graph), "graph must be a DAG"
-
-    topo = list(nx.topological_sort(graph))
+    with instrumentation.phase("soft_shortest_path_dag.validate"):
+        graph, topo = resolve_dag(graph, "soft_shortest_path_dag")
     dT: Dict[Any, float] = {node: float("inf") for node in graph.nodes}
     dT[target] = 0.0
 
-    for v in reversed(topo):
-        if v == target:
-            continue
-        terms = []
-        for _, u, data in graph.out_edges(v, data=True):
-            if np.isfinite(dT[u]):
-                w = float(data.get(weight, 1.0))
-                terms.append(-(w + dT[u]) / temperature)
-        if terms:
-            dT[v] = -temperature * logsumexp(terms)
+    calls = 0
+    with instrumentation.phase("soft_shortest_path_dag.dp"):
+        for v in reversed(topo):
+            if v == target:
+                continue
+            terms = []
+            for _, u, data in graph.out_edges(v, data=True):
+                if np.isfinite(dT[u]):
+                    w = float(data.get(weight, 1.0))
+                    terms.append(-(w + dT[u]) / temperature)
+            if terms:
+                dT[v] = -temperature * special.logsumexp(terms)
+                calls += 1
 
+    if instrumentation.enabled():
+        instrumentation.count("nodes", len(topo))
+        instrumentation.count("edges", graph.number_of_edges())
+        instrumentation.count("logsumexp_calls", calls)
     return float(dT[source]), dT
 
 
 def soft_shortest_path_values(
-    graph: nx.DiGraph,
+    graph: Union[DAG, nx.DiGraph],
     target: Any,
     temperature: float,
     weight: str = "weight",
 ) -> Dict[Any, float]:
     """Return soft shortest-path values d_T(v) for all v to target."""
-    if temperature <= 0:
-        raise ValueError("temperature must be positive")
-    assert nx.is_directed_acyclic_graph(graph), "graph must be a DAG"
     source = target
     _, dT = soft_shortest_path_dag(graph, source, target, temperature, weight=weight)
     return dT
 
 
 def soft_shortest_path(
-    graph: nx.DiGraph,
+    graph: Union[DAG, nx.DiGraph],
     source: Any,
     target: Any,
     temperature: float,
@@ -68,3 +89,353 @@ def soft_shortest_path(
     Returns (d_T(source), d_T values for all nodes).
     """
     return soft_shortest_path_dag(graph, source, target, temperature, weight=weight)
+
+
+def _check_temperatures(temperatures: np.ndarray) -> np.ndarray:
+    temps = np.asarray(temperatures, dtype=np.float64)
+    if temps.ndim != 1 or temps.size == 0:
+        raise ValueError("temperatures must be a non-empty 1-D array")
+    if (temps <= 0).any():
+        raise ValueError("temperature must be positive")
+    return temps
+
+
+def soft_values_temperatures(
+    compiled: CompiledDAG,
+    target: Any,
+    temperatures: np.ndarray,
+    max_block_edges: Optional[int] = None,
+) -> np.ndarray:
+    """Return a (n_temps, n_nodes) matrix of d_T(v) in one level sweep.
+
+    Columns follow compiled node ids; the log-sum-exp of each level is
+    vectorized across the temperature axis. ``max_block_edges`` bounds the
+    edges gathered at once (see backward_sweep), e.g. for memory-mapped graphs.
+    """
+    return _soft_sweep(compiled, target, _check_temperatures(temperatures), max_block_edges=max_block_edges)
+
+
+def _soft_sweep(
+    compiled: CompiledDAG,
+    target: Any,
+    temps: np.ndarray,
+    executor: Optional[Executor] = None,
+    n_chunks: int = 1,
+    min_chunk_edges: int = 1 << 16,
+    max_block_edges: Optional[int] = None,
+) -> np.ndarray:
+    temps = temps[:, None]
+    return backward_sweep(
+        compiled,
+        np.full(temps.shape[0], compiled.node_id(target)),
+        lambda costs, starts: -temps * segment_logsumexp(-costs / temps, starts),
+        executor=executor,
+        n_chunks=n_chunks,
+        min_chunk_edges=min_chunk_edges,
+        max_block_edges=max_block_edges,
+    )
+
+
+def soft_values_pairs(
+    compiled: CompiledDAG,
+    targets: Sequence[Any],
+    temperatures: np.ndarray,
+    max_block_edges: Optional[int] = None,
+) -> np.ndarray:
+    """Return a (n_pairs, n_nodes) matrix with row ``j`` holding d_T(v) towards
+    ``targets[j]`` at ``temperatures[j]``, all rows in one level sweep.
+    ``max_block_edges`` bounds the edges gathered at once (see backward_sweep)."""
+    temps = _check_temperatures(temperatures)
+    if len(targets) != temps.shape[0]:
+        raise ValueError("targets and temperatures must have the same length")
+    ids = np.fromiter((compiled.node_id(t) for t in targets), dtype=np.int64, count=len(targets))
+    temps = temps[:, None]
+    return backward_sweep(
+        compiled,
+        ids,
+        lambda costs, starts: -temps * segment_logsumexp(-costs / temps, starts),
+        max_block_edges=max_block_edges,
+    )
+
+
+def soft_values_compiled(
+    compiled: CompiledDAG,
+    target: Any,
+    temperature: float,
+    max_block_edges: Optional[int] = None,
+) -> np.ndarray:
+    """Return d_T(v) for every compiled node id, sweeping height levels with segment reductions."""
+    if temperature <= 0:
+        raise ValueError("temperature must be positive")
+    return soft_values_temperatures(compiled, target, np.array([temperature]), max_block_edges)[0]
+
+
+def soft_values_parallel(
+    compiled: CompiledDAG,
+    target: Any,
+    temperature: float,
+    workers: Optional[int] = None,
+    min_chunk_edges: int = 1 << 16,
+) -> np.ndarray:
+    """Multithreaded soft_values_compiled; the result is bit-identical to it.
+
+    Each height level is an antichain, so its nodes are split into ``workers``
+    runs of about equal edge count (levels with fewer than
+    ``2 * min_chunk_edges`` edges stay serial) and combined in a thread pool.
+    The NumPy kernels release the GIL. ``workers`` defaults to the CPU count.
+    """
+    if temperature <= 0:
+        raise ValueError("temperature must be positive")
+    workers = workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        values = _soft_sweep(
+            compiled,
+            target,
+            np.array([temperature], dtype=np.float64),
+            executor=pool,
+            n_chunks=workers,
+            min_chunk_edges=min_chunk_edges,
+        )
+    return values[0]
+
+
+def soft_shortest_path_compiled(
+    compiled: CompiledDAG,
+    source: Any,
+    target: Any,
+    temperature: float,
+) -> Tuple[float, np.ndarray]:
+    """Compiled-graph counterpart of soft_shortest_path_dag.
+
+    Returns (d_T(source), d_T array indexed by compiled node id); use
+    ``compiled.to_dict`` for the per-node dict.
+    """
+    values = soft_values_compiled(compiled, target, temperature)
+    return float(values[compiled.node_id(source)]), values
+
+
+def soft_shortest_path_temperatures(
+    graph: nx.DiGraph,
+    source: Any,
+    target: Any,
+    temperatures: np.ndarray,
+    weight: str = "weight",
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (d_T(source) per temperature, (n_temps, n_nodes) d_T matrix) on a DAG.
+
+    Matrix columns follow ``list(graph.nodes)``. The graph is validated, sorted
+    and compiled once for the whole temperature grid.
+    """
+    temps = _check_temperatures(temperatures)
+    compiled = compile_dag(graph, weight=weight)
+    values = soft_values_temperatures(compiled, target, temps)
+    columns = np.fromiter((compiled.index[node] for node in graph.nodes), dtype=np.int64)
+    return values[:, compiled.node_id(source)].copy(), values[:, columns]
+
+
+def iter_soft_value_blocks(
+    compiled: CompiledDAG,
+    targets: Sequence[Any],
+    temperature: float,
+    block_size: int = 256,
+) -> Iterator[Tuple[List[Any], np.ndarray]]:
+    """Yield (target block, (n_nodes, block) matrix of d_T(v, t)) for many sinks.
+
+    Each block is one level sweep over the shared compiled edges; memory is
+    bounded by ``n_nodes * block_size`` values. Rows follow compiled node ids.
+    """
+    if temperature <= 0:
+        raise ValueError("temperature must be positive")
+    if block_size <= 0:
+        raise ValueError("block_size must be positive")
+    targets = list(targets)
+    for start in range(0, len(targets), block_size):
+        block = targets[start:start + block_size]
+        ids = np.fromiter((compiled.node_id(t) for t in block), dtype=np.int64, count=len(block))
+        values = backward_sweep(
+            compiled,
+            ids,
+            lambda costs, starts: -temperature * segment_logsumexp(-costs / temperature, starts),
+        )
+        yield block, values.T
+
+
+def soft_values_targets(
+    compiled: CompiledDAG,
+    targets: Sequence[Any],
+    temperature: float,
+    block_size: int = 256,
+) -> np.ndarray:
+    """Return the dense (n_nodes, n_targets) matrix of d_T(v, t) for the given sinks."""
+    out = np.empty((compiled.n_nodes, len(targets)))
+    col = 0
+    for block, values in iter_soft_value_blocks(compiled, targets, temperature, block_size):
+        out[:, col:col + len(block)] = values
+        col += len(block)
+    return out
+
+
+@dataclass(frozen=True)
+class SoftHardSweep:
+    """Outputs of soft_hard_sweep; arrays follow compiled node / edge order."""
+
+    compiled: CompiledDAG
+    d_star: np.ndarray
+    d_T: np.ndarray
+    edge_marginals: np.ndarray
+    expected_cost: float
+
+    def marginals_by_edge(self) -> Dict[Tuple[Any, Any], float]:
+        """Return {(u, v): expected usage of edge u->v} for edges with nonzero usage."""
+        nodes = self.compiled.nodes
+        tails = np.repeat(np.arange(self.compiled.n_nodes), np.diff(self.compiled.indptr))
+        used = np.flatnonzero(self.edge_marginals)
+        return {
+            (nodes[tails[e]], nodes[self.compiled.indices[e]]): float(self.edge_marginals[e])
+            for e in used
+        }
+
+
+def soft_hard_sweep(
+    graph: Union[CompiledDAG, nx.DiGraph],
+    source: Any,
+    target: Any,
+    temperature: float,
+    weight: str = "weight",
+) -> SoftHardSweep:
+    """Compute d*, d_T, soft edge marginals and E[C] in one backward + one forward pass.
+
+    The backward level sweep evaluates the hard min and the soft log-sum-exp on
+    the same gathered edge costs. The forward sweep pushes source occupancy along
+    the Boltzmann transition probabilities exp(-(w + d_T(u) - d_T(v)) / T); the
+    resulting edge marginals equal the gradient of d_T(source) with respect to
+    the edge weights.
+    """
+    if temperature <= 0:
+        raise ValueError("temperature must be positive")
+    compiled = graph if isinstance(graph, CompiledDAG) else compile_dag(graph, weight=weight)
+    s = compiled.node_id(source)
+    t = compiled.node_id(target)
+    n = compiled.n_nodes
+    d_star = np.full(n, np.inf)
+    d_T = np.full(n, np.inf)
+    d_star[t] = 0.0
+    d_T[t] = 0.0
+    tails = np.repeat(np.arange(n), np.diff(compiled.indptr))
+
+    for level in range(1, compiled.n_levels):
+        lo, hi, e_lo, e_hi = compiled.level_bounds(level)
+        heads = compiled.indices[e_lo:e_hi]
+        w = compiled.weights[e_lo:e_hi]
+        starts = compiled.indptr[lo:hi] - e_lo
+        d_star[lo:hi] = np.minimum.reduceat(w + d_star[heads], starts)
+        d_T[lo:hi] = -temperature * segment_logsumexp(-(w + d_T[heads]) / temperature, starts)
+        if lo <= t < hi:
+            d_star[t] = 0.0
+            d_T[t] = 0.0
+
+    if not np.isfinite(d_T[s]):
+        raise ValueError("No paths from source to target")
+
+    live = np.isfinite(d_T[tails])
+    prob = np.zeros(compiled.n_edges)
+    prob[live] = np.exp(
+        -(compiled.weights[live] + d_T[compiled.indices[live]] - d_T[tails[live]]) / temperature
+    )
+    occupancy = np.zeros(n)
+    occupancy[s] = 1.0
+    marginals = np.zeros(compiled.n_edges)
+    source_level = int(np.searchsorted(compiled.level_ptr, s, side="right")) - 1
+    for level in range(source_level, 0, -1):
+        lo, hi, e_lo, e_hi = compiled.level_bounds(level)
+        flow = occupancy[tails[e_lo:e_hi]] * prob[e_lo:e_hi]
+        if lo <= t < hi:
+            flow[tails[e_lo:e_hi] == t] = 0.0
+        marginals[e_lo:e_hi] = flow
+        np.add.at(occupancy, compiled.indices[e_lo:e_hi], flow)
+
+    return SoftHardSweep(
+        compiled=compiled,
+        d_star=d_star,
+        d_T=d_T,
+        edge_marginals=marginals,
+        expected_cost=float(marginals @ compiled.weights),
+    )
+
+
+def soft_gap_values(
+    compiled: CompiledDAG,
+    target: Any,
+    temperature: float,
+    cutoff: float = 40.0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (d*(v), gap(v) = d*(v) - d_T(v)) per compiled node, for small temperatures.
+
+    Works in slack space: with slack s_e = w + d*(u) - d*(v) >= 0,
+    gap(v) = T log sum_e exp((gap(u) - s_e) / T), where the optimal edge gives a
+    term >= 1. Edges with (gap(u) - s_e) / T < -cutoff are pruned (each adds
+    less than e^-cutoff relative to the sum, i.e. below float64 precision of d_T
+    for the default), and nodes left with a single edge skip the log. No
+    exponential of a raw cost is formed and corrections go through log1p, so
+    with ``cutoff=np.inf`` even gaps far below the precision of d* keep full
+    relative precision where d* - d_T would cancel to zero.
+    """
+    if temperature <= 0:
+        raise ValueError("temperature must be positive")
+    if cutoff <= 0:
+        raise ValueError("cutoff must be positive")
+    t = compiled.node_id(target)
+    d_star = np.full(compiled.n_nodes, np.inf)
+    gap = np.zeros(compiled.n_nodes)
+    d_star[t] = 0.0
+
+    for level in range(1, compiled.n_levels):
+        lo, hi, e_lo, e_hi = compiled.level_bounds(level)
+        heads = compiled.indices[e_lo:e_hi]
+        costs = compiled.weights[e_lo:e_hi] + d_star[heads]
+        lengths = np.diff(compiled.indptr[lo:hi + 1])
+        best = np.minimum.reduceat(costs, compiled.indptr[lo:hi] - e_lo)
+        d_star[lo:hi] = best
+        if lo <= t < hi:
+            d_star[t] = 0.0
+            best[t - lo] = np.inf
+
+        tails = np.repeat(np.arange(hi - lo), lengths)
+        live = np.flatnonzero(np.isfinite(costs) & np.isfinite(best[tails]))
+        x = (gap[heads[live]] - (costs[live] - best[tails[live]])) / temperature
+        keep = x >= -cutoff
+        live, x = live[keep], x[keep]
+        rows = tails[live]
+
+        peak = np.full(hi - lo, -np.inf)
+        np.maximum.at(peak, rows, x)
+        level_gap = temperature * np.where(np.isfinite(peak), peak, 0.0)
+        multi = np.bincount(rows, minlength=hi - lo) > 1
+        if multi.any():
+            # Sum the non-peak terms separately so log1p keeps tiny corrections exact.
+            edge = np.arange(rows.shape[0])
+            first = np.full(hi - lo, rows.shape[0])
+            np.minimum.at(first, rows, np.where(x == peak[rows], edge, rows.shape[0]))
+            rest = edge != first[rows]
+            others = np.bincount(rows[rest], weights=np.exp(x[rest] - peak[rows[rest]]), minlength=hi - lo)
+            level_gap[multi] += temperature * np.log1p(others[multi])
+        gap[lo:hi] = level_gap
+        if lo <= t < hi:
+            gap[t] = 0.0
+
+    return d_star, gap
+
+
+def soft_shortest_path_low_temperature(
+    graph: nx.DiGraph,
+    source: Any,
+    target: Any,
+    temperature: float,
+    cutoff: float = 40.0,
+    weight: str = "weight",
+) -> Tuple[float, Dict[Any, float]]:
+    """Small-T counterpart of soft_shortest_path_dag: d_T = d* - gap via soft_gap_values."""
+    compiled = compile_dag(graph, weight=weight)
+    d_star, gap = soft_gap_values(compiled, target, temperature, cutoff=cutoff)
+    values = d_star - gap
+    return float(values[compiled.node_id(source)]), compiled.to_dict(values)
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
 import json
+from array import array
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
-import networkx as nx
+import numpy as np
 
+from ._lazy import lazy_module
 
-@dataclass(frozen=True)
+nx = lazy_module("networkx")
+
+
+@dataclass(frozen=True, slots=True)
 class Edge:
     u: Any
     v: Any
@@ -15,30 +20,107 @@ class Edge:
 
 
 class DAG:
-    """Finite directed acyclic graph wrapper."""
+    """Finite directed acyclic graph wrapper.
+
+    Validation results (acyclicity, topological order, depth layers, nodes
+    reaching the sink) are cached until the next mutation made through the
+    wrapper; edit ``graph`` directly only before querying, or the caches go stale.
+    """
 
     def __init__(self) -> None:
         self.graph = nx.DiGraph()
         self.source: Optional[Any] = None
         self.sink: Optional[Any] = None
+        self._version = 0
+        self._cache: Dict[str, Any] = {}
+        self._cache_version = 0
+
+    @property
+    def version(self) -> int:
+        """Counter bumped by every mutation made through this wrapper."""
+        return self._version
 
     def add_node(self, node: Any) -> None:
         self.graph.add_node(node)
+        self._version += 1
 
     def add_edge(self, u: Any, v: Any, weight: float) -> None:
         self.graph.add_edge(u, v, weight=float(weight))
+        self._version += 1
+
+    def set_edge_attr(self, u: Any, v: Any, attr: str, value: float) -> None:
+        """Set ``attr`` on edge u->v (adding the edge if needed) and drop the caches.
+
+        Unlike add_edge, which always writes ``"weight"``, this writes any
+        attribute name, e.g. the one a ``weight=`` argument points engines at.
+        """
+        self.graph.add_edge(u, v, **{attr: float(value)})
+        self._version += 1
 
     def set_source_sink(self, source: Any, sink: Any) -> None:
         self.source = source
         self.sink = sink
+        self._version += 1
+
+    def _cached(self, name: str, compute: Callable[[], Any]) -> Any:
+        if self._cache_version != self._version:
+            self._cache.clear()
+            self._cache_version = self._version
+        if name not in self._cache:
+            self._cache[name] = compute()
+        return self._cache[name]
+
+    def _sorted_nodes(self) -> Optional[Tuple[Any, ...]]:
+        """Topological order, or None for a cyclic graph (one traversal for both)."""
+
+        def compute() -> Optional[Tuple[Any, ...]]:
+            try:
+                return tuple(nx.topological_sort(self.graph))
+            except nx.NetworkXUnfeasible:
+                return None
+
+        return self._cached("topological_order", compute)
+
+    def is_acyclic(self) -> bool:
+        return self._sorted_nodes() is not None
 
     def validate_acyclic(self) -> None:
-        if not nx.is_directed_acyclic_graph(self.graph):
+        if not self.is_acyclic():
             raise ValueError("Graph must be a DAG.")
 
-    def topological_sort(self) -> List[Any]:
+    def topological_order(self) -> Tuple[Any, ...]:
+        """Cached topological order as an immutable tuple."""
         self.validate_acyclic()
-        return list(nx.topological_sort(self.graph))
+        order = self._sorted_nodes()
+        assert order is not None
+        return order
+
+    def topological_sort(self) -> List[Any]:
+        return list(self.topological_order())
+
+    def depth_layers(self) -> List[List[Any]]:
+        """Antichain layers by height: layer k holds nodes whose longest path to a sink has k edges."""
+
+        def compute() -> List[List[Any]]:
+            height: Dict[Any, int] = {}
+            for v in reversed(self.topological_order()):
+                height[v] = 1 + max((height[u] for u in self.graph.successors(v)), default=-1)
+            layers: List[List[Any]] = [[] for _ in range(max(height.values(), default=-1) + 1)]
+            for v in self.topological_order():
+                layers[height[v]].append(v)
+            return layers
+
+        return [list(layer) for layer in self._cached("depth_layers", compute)]
+
+    def reaches_sink(self) -> FrozenSet[Any]:
+        """Nodes with a path to ``sink`` (including the sink itself)."""
+        if self.sink is None:
+            raise ValueError("sink is not set")
+        sink = self.sink
+        return self._cached(
+            f"reaches_sink:{sink!r}",
+            lambda: frozenset(nx.ancestors(self.graph, sink)) | {sink},
+        )
 
     def edges(self) -> List[Edge]:
         return [Edge(u, v, data.get("weight", 1.0)) for u, v, data in self.graph.edges(data=True)]
@@ -56,6 +138,237 @@ class DAG:
             total += float(self.graph[nodes[i]][nodes[i + 1]].get("weight", 1.0))
         return total
 
+    def path_costs(self, paths: Iterable[Iterable[Any]]) -> np.ndarray:
+        """Costs of many paths; see CompactDAG for the vectorized version."""
+        return np.array([self.path_cost(path) for path in paths], dtype=np.float64)
+
+
+class EdgeView(Sequence[Edge]):
+    """Read-only sequence over edge columns that builds Edge objects on access."""
+
+    __slots__ = ("_labels", "_u", "_v", "_w")
+
+    def __init__(self, labels: Sequence[Any], u: np.ndarray, v: np.ndarray, w: np.ndarray) -> None:
+        self._labels = labels
+        self._u = u
+        self._v = v
+        self._w = w
+
+    def __len__(self) -> int:
+        return int(self._u.shape[0])
+
+    def __getitem__(self, i: int) -> Edge:  # type: ignore[override]
+        return Edge(self._labels[self._u[i]], self._labels[self._v[i]], float(self._w[i]))
+
+    def __iter__(self) -> Iterator[Edge]:
+        labels = self._labels
+        for u, v, w in zip(self._u.tolist(), self._v.tolist(), self._w.tolist()):
+            yield Edge(labels[u], labels[v], w)
+
+
+class CompactDAG(DAG):
+    """Array-backed DAG: interned integer node ids and int64/float64 edge columns.
+
+    Edges cost 24 bytes each (``array`` columns for u, v and weight) instead of
+    a networkx adjacency entry plus attribute dict. The DAG API keeps working:
+    ``graph`` / to_networkx() materialize a networkx copy on demand (cached per
+    version, so edits to it are not written back), and repeated (u, v) pairs
+    keep the last weight, as with ``nx.DiGraph.add_edge``. Topological order,
+    depth layers and reaches_sink come from the compiled CSR, and the soft,
+    hard and path-statistics entry points answer from it too, so the networkx
+    copy is only built when ``graph`` / to_networkx() is asked for.
+    """
+
+    def __init__(self) -> None:
+        self.source = None
+        self.sink = None
+        self._version = 0
+        self._cache = {}
+        self._cache_version = 0
+        self._labels: List[Any] = []
+        self._ids: Dict[Any, int] = {}
+        self._u = array("q")
+        self._v = array("q")
+        self._w = array("d")
+
+    @classmethod
+    def from_dag(cls, dag: DAG) -> "CompactDAG":
+        compact = cls()
+        for node in dag.nodes():
+            compact.add_node(node)
+        for u, v, data in dag.to_networkx().edges(data=True):
+            compact.add_edge(u, v, data.get("weight", 1.0))
+        if dag.source is not None or dag.sink is not None:
+            compact.set_source_sink(dag.source, dag.sink)
+        return compact
+
+    @property
+    def graph(self) -> nx.DiGraph:  # type: ignore[override]
+        return self.to_networkx()
+
+    def __contains__(self, node: Any) -> bool:
+        return node in self._ids
+
+    def node_id(self, node: Any) -> int:
+        """Interned integer id of ``node``."""
+        return self._ids[node]
+
+    def _intern(self, node: Any) -> int:
+        i = self._ids.get(node)
+        if i is None:
+            i = self._ids[node] = len(self._labels)
+            self._labels.append(node)
+        return i
+
+    def add_node(self, node: Any) -> None:
+        self._intern(node)
+        self._version += 1
+
+    def add_edge(self, u: Any, v: Any, weight: float) -> None:
+        self._u.append(self._intern(u))
+        self._v.append(self._intern(v))
+        self._w.append(float(weight))
+        self._version += 1
+
+    def set_edge_attr(self, u: Any, v: Any, attr: str, value: float) -> None:
+        if attr != "weight":
+            raise ValueError("CompactDAG stores a single 'weight' per edge")
+        self.add_edge(u, v, value)
+
+    def columns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Deduplicated (u ids, v ids, weights), sorted by (u, v)."""
+        return self._edge_table()[1:]
+
+    def _edge_table(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        def compute() -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+            # Copies, so the growable array columns never export a live buffer.
+            u = np.frombuffer(self._u, dtype=np.int64).copy()
+            v = np.frombuffer(self._v, dtype=np.int64).copy()
+            w = np.frombuffer(self._w, dtype=np.float64).copy()
+            keys = u * len(self._labels) + v
+            if keys.size == 0:
+                return keys, u, v, w
+            order = np.argsort(keys, kind="stable")
+            keys = keys[order]
+            last = np.append(keys[1:] != keys[:-1], True)
+            keep = order[last]
+            return keys[last], u[keep], v[keep], w[keep]
+
+        return self._cached("edge_table", compute)
+
+    def compile(self) -> Any:
+        """Return the CompiledDAG (cached per version) without going through networkx."""
+        from .compiled import compile_edge_arrays
+
+        return self._cached(
+            "compiled",
+            lambda: compile_edge_arrays(self._labels, *self.columns()),
+        )
+
+    def _sorted_nodes(self) -> Optional[Tuple[Any, ...]]:
+        def compute() -> Optional[Tuple[Any, ...]]:
+            try:
+                compiled = self.compile()
+            except ValueError:
+                return None
+            return tuple(reversed(compiled.nodes))
+
+        return self._cached("topological_order", compute)
+
+    def depth_layers(self) -> List[List[Any]]:
+        self.validate_acyclic()
+        compiled = self.compile()
+        return [list(compiled.nodes[lo:hi]) for lo, hi in zip(compiled.level_ptr[:-1], compiled.level_ptr[1:])]
+
+    def reaches_sink(self) -> FrozenSet[Any]:
+        if self.sink is None:
+            raise ValueError("sink is not set")
+        sink = self.sink
+
+        def compute() -> FrozenSet[Any]:
+            from .cone import backward_reachable
+
+            compiled = self.compile()
+            reach = backward_reachable(compiled, compiled.node_id(sink))
+            return frozenset(compiled.nodes[i] for i in np.flatnonzero(reach))
+
+        return self._cached(f"reaches_sink:{sink!r}", compute)
+
+    def edges(self) -> List[Edge]:
+        return list(self.edge_view())
+
+    def edge_view(self) -> EdgeView:
+        """Lazy, allocation-free view of the deduplicated edges."""
+        return EdgeView(self._labels, *self.columns())
+
+    def nodes(self) -> List[Any]:
+        return list(self._labels)
+
+    def to_networkx(self) -> nx.DiGraph:
+        def compute() -> nx.DiGraph:
+            graph = nx.DiGraph()
+            graph.add_nodes_from(self._labels)
+            labels = self._labels
+            u, v, w = self.columns()
+            graph.add_weighted_edges_from(
+                (labels[a], labels[b], c) for a, b, c in zip(u.tolist(), v.tolist(), w.tolist())
+            )
+            return graph
+
+        return self._cached("networkx", compute)
+
+    def path_cost(self, path: Iterable[Any]) -> float:
+        return float(self.path_costs([path])[0])
+
+    def path_costs(self, paths: Iterable[Iterable[Any]]) -> np.ndarray:
+        """Costs of many paths at once, summed left to right like path_cost.
+
+        Hops are looked up with one searchsorted over the sorted (u, v) keys and
+        accumulated column by column, so each cost is bit-identical to a
+        sequential sum. Raises KeyError for unknown nodes or missing edges.
+        """
+        paths = [list(path) for path in paths]
+        lengths = np.fromiter((len(p) for p in paths), dtype=np.int64, count=len(paths))
+        ids = np.fromiter((self._ids[x] for p in paths for x in p), dtype=np.int64, count=int(lengths.sum()))
+        hops = np.maximum(lengths - 1, 0)
+        costs = np.zeros(len(paths))
+        if not hops.any():
+            return costs
+
+        last = np.zeros(ids.shape[0], dtype=bool)
+        last[np.cumsum(lengths)[lengths > 0] - 1] = True
+        tails = np.flatnonzero(~last)
+        table_keys, _, _, table_w = self._edge_table()
+        keys = ids[tails] * len(self._labels) + ids[tails + 1]
+        pos = np.minimum(np.searchsorted(table_keys, keys), max(table_keys.shape[0] - 1, 0))
+        missing = table_keys.shape[0] == 0 or not np.array_equal(table_keys[pos], keys)
+        if missing:
+            bad = 0 if table_keys.shape[0] == 0 else int(np.flatnonzero(table_keys[pos] != keys)[0])
+            a, b = divmod(int(keys[bad]), len(self._labels))
+            raise KeyError(f"no edge {self._labels[a]!r} -> {self._labels[b]!r}")
+
+        hop_w = np.zeros((len(paths), int(hops.max())))
+        hop_w[np.arange(hop_w.shape[1]) < hops[:, None]] = table_w[pos]
+        for j in range(hop_w.shape[1]):
+            costs += hop_w[:, j]
+        return costs
+
+
+def resolve_dag(graph: Union[DAG, nx.DiGraph], caller: str) -> Tuple[nx.DiGraph, Tuple[Any, ...]]:
+    """Return (networkx graph, topological order), checking acyclicity in the same pass.
+
+    DAG wrappers answer from their cached order; raises ValueError naming
+    ``caller`` for cyclic graphs.
+    """
+    if isinstance(graph, DAG):
+        if not graph.is_acyclic():
+            raise ValueError(f"{caller} expects a DAG")
+        return graph.graph, graph.topological_order()
+    try:
+        return graph, tuple(nx.topological_sort(graph))
+    except nx.NetworkXUnfeasible:
+        raise ValueError(f"{caller} expects a DAG") from None
+
 
 def load_dag_from_json(path: str) -> DAG:
     """Load a DAG from a JSON file with fields: nodes, edges (u, v, weight), source, sink."""
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import heapq
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from ._lazy import lazy_module
+from .entropy_regularized import soft_shortest_path_values
+from .graph import DAG, CompactDAG
+
+nx = lazy_module("networkx")
+special = lazy_module("scipy.special")
+
+
+class IncrementalSoftValues:
+    """Keep d_T(v) for every node of a DAG up to date under edge updates.
+
+    Edge insertions and weight changes go through ``add_edge`` / ``update_weight``,
+    which mutate the wrapped DAG and then recompute only ancestors of the changed
+    edge, in reverse topological order. Propagation stops at nodes whose value
+    moved by at most ``tol`` (``tol=0`` keeps values exact).
+    """
+
+    def __init__(
+        self,
+        dag: DAG,
+        target: Any,
+        temperature: float,
+        tol: float = 0.0,
+        weight: str = "weight",
+    ) -> None:
+        if temperature <= 0:
+            raise ValueError("temperature must be positive")
+        if tol < 0:
+            raise ValueError("tol must be non-negative")
+        if isinstance(dag, CompactDAG) and weight != "weight":
+            raise ValueError("CompactDAG stores a single weight per edge; use weight='weight'")
+        self.dag = dag
+        self.target = target
+        self.temperature = float(temperature)
+        self.tol = float(tol)
+        self.weight = weight
+        self.values: Dict[Any, float] = {}
+        self._pos: Dict[Any, int] = {}
+        self._span = (0, -1)
+        self.recompute()
+
+    def recompute(self) -> None:
+        """Rebuild all values and the topological positions from scratch."""
+        self._graph = self._adjacency()
+        self._set_order(self.dag.topological_sort())
+        self.values = soft_shortest_path_values(self._graph, self.target, self.temperature, weight=self.weight)
+
+    def _adjacency(self) -> nx.DiGraph:
+        """Graph the updates walk.
+
+        A DAG's own networkx graph stays live. CompactDAG.to_networkx() is a
+        per-version snapshot, so a CompactDAG gets a private copy built once and
+        kept in step by _write instead of a rebuild after every update.
+        """
+        if not isinstance(self.dag, CompactDAG):
+            return self.dag.to_networkx()
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self.dag.nodes())
+        graph.add_weighted_edges_from((e.u, e.v, e.weight) for e in self.dag.edge_view())
+        return graph
+
+    def _write(self, u: Any, v: Any, weight: float) -> None:
+        self.dag.set_edge_attr(u, v, self.weight, weight)
+        if isinstance(self.dag, CompactDAG):
+            self._graph.add_edge(u, v, weight=float(weight))
+
+    def _set_order(self, order: List[Any]) -> None:
+        self._pos = {node: i for i, node in enumerate(order)}
+        self._span = (0, len(order) - 1)
+
+    def value(self, node: Any) -> float:
+        return self.values[node]
+
+    def add_edge(self, u: Any, v: Any, weight: float) -> int:
+        """Insert (or overwrite) edge u->v and return the number of nodes recomputed."""
+        graph = self._graph
+        if u in graph and v in graph and nx.has_path(graph, v, u):
+            raise ValueError("Graph must be a DAG.")
+
+        # A new tail has no in-edges and a new head no out-edges, so they can go
+        # at the front and back of the current order respectively.
+        lo, hi = self._span
+        if u not in self._pos:
+            lo -= 1
+            self._pos[u] = lo
+            self.values[u] = 0.0 if u == self.target else float("inf")
+        if v not in self._pos:
+            hi += 1
+            self._pos[v] = hi
+            self.values[v] = 0.0 if v == self.target else float("inf")
+        self._span = (lo, hi)
+
+        self._write(u, v, weight)
+        if self._pos[u] >= self._pos[v]:
+            # Reorder the graph as it is after the write, new edge included.
+            self._set_order(list(nx.topological_sort(self._graph)))
+        return self._propagate(u)
+
+    def update_weight(self, u: Any, v: Any, weight: float) -> int:
+        """Change the weight of an existing edge and return the number of nodes recomputed."""
+        if not self._graph.has_edge(u, v):
+            raise ValueError(f"edge {u!r}->{v!r} is not in the graph")
+        self._write(u, v, weight)
+        return self._propagate(u)
+
+    def _local_value(self, v: Any) -> float:
+        terms = []
+        for _, u, data in self._graph.out_edges(v, data=True):
+            if np.isfinite(self.values[u]):
+                w = float(data.get(self.weight, 1.0))
+                terms.append(-(w + self.values[u]) / self.temperature)
+        if not terms:
+            return float("inf")
+        return float(-self.temperature * special.logsumexp(terms))
+
+    def _changed(self, old: float, new: float) -> bool:
+        if np.isinf(old) or np.isinf(new):
+            return old != new
+        return abs(new - old) > self.tol
+
+    def _propagate(self, start: Any) -> int:
+        graph = self._graph
+        heap: List[Tuple[int, Any]] = [(-self._pos[start], start)]
+        queued = {start}
+        recomputed = 0
+        while heap:
+            _, v = heapq.heappop(heap)
+            queued.discard(v)
+            if v == self.target:
+                continue
+            new = self._local_value(v)
+            recomputed += 1
+            old = self.values[v]
+            self.values[v] = new
+            if not self._changed(old, new):
+                continue
+            for p in graph.predecessors(v):
+                if p not in queued:
+                    queued.add(p)
+                    heapq.heappush(heap, (-self._pos[p], p))
+        return recomputed
@@ -0,0 +1,418 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from . import instrumentation
+from .binary_format import load_binary_dag, write_binary_dag
+from .compiled import CompiledDAG, kahn_heights
+
+DEFAULT_CHUNK_EDGES = 1 << 20
+_READ_BLOCK = 1 << 20
+_FORMATS = {".csv": "csv", ".tsv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson", ".json": "json"}
+
+
+@dataclass
+class EdgeChunk:
+    """One block of parsed edges; ``nodes`` lists extra (possibly isolated) node labels."""
+
+    tails: List[Any]
+    heads: List[Any]
+    weights: List[float]
+    nodes: List[Any] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.tails)
+
+
+def detect_format(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in _FORMATS:
+        raise ValueError(f"cannot infer edge-list format from {path!r}; pass fmt='csv', 'ndjson' or 'json'")
+    return _FORMATS[ext]
+
+
+def _edge_from_record(record: Any, weight: str) -> Tuple[Any, Any, float]:
+    if isinstance(record, dict):
+        u = record["u"] if "u" in record else record["source"]
+        v = record["v"] if "v" in record else record["target"]
+        return u, v, float(record.get(weight, 1.0))
+    if len(record) == 2:
+        return record[0], record[1], 1.0
+    return record[0], record[1], float(record[2])
+
+
+class _JSONStream:
+    """Incremental reader for a top-level JSON object whose large arrays are
+    consumed element by element, so the file is never held in memory."""
+
+    def __init__(self, f: Any) -> None:
+        self._f = f
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        block = self._f.read(_READ_BLOCK)
+        if not block:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + block
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos].isspace():
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise ValueError("unexpected end of JSON input")
+
+    def expect(self, chars: str) -> str:
+        ch = self.peek()
+        if ch not in chars:
+            raise ValueError(f"malformed JSON: expected one of {chars!r}, got {ch!r}")
+        self._pos += 1
+        return ch
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next block.
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def items(self, streamed: Tuple[str, ...]) -> Iterator[Tuple[str, Any]]:
+        """Yield (key, value) for the top-level object; arrays under ``streamed``
+        keys are yielded as (key, element) pairs instead of whole."""
+        self.expect("{")
+        if self.peek() == "}":
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            if key in streamed and self.peek() == "[":
+                self.expect("[")
+                if self.peek() != "]":
+                    while True:
+                        yield key, self.value()
+                        if self.expect(",]") == "]":
+                            break
+                else:
+                    self.expect("]")
+            else:
+                yield key, self.value()
+            if self.expect(",}") == "}":
+                return
+
+
+class EdgeListReader:
+    """Chunked reader for CSV, NDJSON and JSON edge lists.
+
+    * CSV: ``u,v[,weight]`` rows with an optional header naming the columns
+      (``u``/``source``, ``v``/``target`` and ``weight``); labels stay strings.
+    * NDJSON: one ``[u, v, w]`` list or ``{"u", "v", "weight"}`` object per line.
+    * JSON: the load_dag_from_json layout; ``nodes`` and ``edges`` are streamed
+      and ``source`` / ``sink`` are recorded on the reader once seen.
+
+    Iterating yields EdgeChunk blocks of at most ``chunk_edges`` edges.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fmt: Optional[str] = None,
+        chunk_edges: int = DEFAULT_CHUNK_EDGES,
+        weight: str = "weight",
+    ) -> None:
+        if chunk_edges <= 0:
+            raise ValueError("chunk_edges must be positive")
+        self.path = path
+        self.fmt = fmt or detect_format(path)
+        if self.fmt not in ("csv", "ndjson", "json"):
+            raise ValueError(f"unknown edge-list format {self.fmt!r}")
+        self.chunk_edges = chunk_edges
+        self.weight = weight
+        self.source: Optional[Any] = None
+        self.sink: Optional[Any] = None
+
+    def __iter__(self) -> Iterator[EdgeChunk]:
+        chunk = EdgeChunk([], [], [])
+        for kind, item in getattr(self, f"_iter_{self.fmt}")():
+            if kind == "node":
+                chunk.nodes.append(item)
+                continue
+            u, v, w = item
+            chunk.tails.append(u)
+            chunk.heads.append(v)
+            chunk.weights.append(w)
+            if len(chunk) >= self.chunk_edges:
+                yield chunk
+                chunk = EdgeChunk([], [], [])
+        if len(chunk) or chunk.nodes:
+            yield chunk
+
+    def _iter_csv(self) -> Iterator[Tuple[str, Any]]:
+        with open(self.path, "r", encoding="utf-8", newline="") as f:
+            dialect = "excel-tab" if self.path.lower().endswith(".tsv") else "excel"
+            rows = csv.reader(f, dialect)
+            columns = (0, 1, 2)
+            for i, row in enumerate(rows):
+                if not row:
+                    continue
+                if i == 0 and _is_header(row):
+                    columns = _csv_columns(row, self.weight)
+                    continue
+                w = float(row[columns[2]]) if columns[2] is not None and len(row) > columns[2] else 1.0
+                yield "edge", (row[columns[0]], row[columns[1]], w)
+
+    def _iter_ndjson(self) -> Iterator[Tuple[str, Any]]:
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield "edge", _edge_from_record(json.loads(line), self.weight)
+
+    def _iter_json(self) -> Iterator[Tuple[str, Any]]:
+        with open(self.path, "r", encoding="utf-8") as f:
+            for key, value in _JSONStream(f).items(("nodes", "edges")):
+                if key == "nodes":
+                    yield "node", value
+                elif key == "edges":
+                    yield "edge", _edge_from_record(value, self.weight)
+                elif key == "source":
+                    self.source = value
+                elif key == "sink":
+                    self.sink = value
+
+
+_COLUMN_NAMES = {"u", "v", "source", "target", "src", "dst", "from", "to"}
+
+
+def _is_header(row: List[str]) -> bool:
+    if len(row) > 2 and not _is_number(row[2]):
+        return True
+    return {cell.strip().lower() for cell in row[:2]} <= _COLUMN_NAMES
+
+
+def _is_number(text: str) -> bool:
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
+
+
+def _csv_columns(header: List[str], weight: str) -> Tuple[int, int, Optional[int]]:
+    names = [name.strip().lower() for name in header]
+
+    def find(*candidates: str) -> Optional[int]:
+        for name in candidates:
+            if name in names:
+                return names.index(name)
+        return None
+
+    u = find("u", "source", "src", "from")
+    v = find("v", "target", "dst", "to")
+    w = find(weight.lower(), "weight", "w", "cost")
+    if w is None and len(names) > 2:
+        w = 2
+    return 0 if u is None else u, 1 if v is None else v, w
+
+
+class _Spill:
+    """Append-only raw array files in a work directory."""
+
+    def __init__(self, directory: str, dtypes: Dict[str, str]) -> None:
+        self.paths = {name: os.path.join(directory, f"{name}.raw") for name in dtypes}
+        self.dtypes = dtypes
+        self.count = 0
+        self._files = {name: open(path, "wb") for name, path in self.paths.items()}
+
+    def append(self, **arrays: np.ndarray) -> None:
+        for name, array in arrays.items():
+            np.asarray(array, dtype=self.dtypes[name]).tofile(self._files[name])
+        self.count += len(next(iter(arrays.values())))
+
+    def close(self) -> Dict[str, np.ndarray]:
+        for f in self._files.values():
+            f.close()
+        return {name: _open_raw(self.paths[name], self.dtypes[name], self.count, "r") for name in self.paths}
+
+
+def _open_raw(path: str, dtype: str, count: int, mode: str) -> np.ndarray:
+    if count == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode=mode, shape=(count,))
+
+
+def _chunked_bincount(keys: np.ndarray, n: int, block: int, remap: Optional[np.ndarray] = None) -> np.ndarray:
+    counts = np.zeros(n, dtype=np.int64)
+    for start in range(0, keys.shape[0], block):
+        part = np.asarray(keys[start:start + block])
+        counts += np.bincount(part if remap is None else remap[part], minlength=n)
+    return counts
+
+
+def _scatter_by_key(
+    keys: np.ndarray,
+    ptr: np.ndarray,
+    columns: List[Tuple[np.ndarray, np.ndarray]],
+    block: int,
+    remap: Optional[np.ndarray] = None,
+) -> None:
+    """Out-of-core stable counting sort: copy each (src, dst) column pair so that
+    entries land grouped by key at ``ptr[key]``, keeping input order per key."""
+    cursor = np.array(ptr[:-1], dtype=np.int64)
+    for start in range(0, keys.shape[0], block):
+        part = np.asarray(keys[start:start + block])
+        if remap is not None:
+            part = remap[part]
+        order = np.argsort(part, kind="stable")
+        sorted_keys = part[order]
+        first = np.searchsorted(sorted_keys, sorted_keys, side="left")
+        pos = cursor[sorted_keys] + np.arange(sorted_keys.shape[0]) - first
+        for src, dst in columns:
+            dst[pos] = np.asarray(src[start:start + block])[order]
+        cursor += np.bincount(part, minlength=cursor.shape[0])
+
+
+def compile_edge_arrays_external(
+    nodes: List[Any],
+    sources: np.ndarray,
+    targets: np.ndarray,
+    weights: np.ndarray,
+    directory: str,
+    max_block_edges: int = DEFAULT_CHUNK_EDGES,
+) -> CompiledDAG:
+    """Out-of-core compile_edge_arrays over (possibly memory-mapped) edge arrays.
+
+    Edge-sized work arrays live as memory maps in ``directory`` and are touched
+    ``max_block_edges`` entries at a time; only O(n_nodes) arrays are held in
+    memory. The result is identical to compile_edge_arrays on the same inputs.
+    """
+    n = len(nodes)
+    m = sources.shape[0]
+    block = max_block_edges
+
+    in_degree = _chunked_bincount(targets, n, block)
+    rev_ptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(in_degree, out=rev_ptr[1:])
+    rev_src = _open_raw(os.path.join(directory, "csr_rev_src.raw"), "<i8", m, "w+")
+    _scatter_by_key(targets, rev_ptr, [(sources, rev_src)], block)
+    height = kahn_heights(_chunked_bincount(sources, n, block), rev_ptr, rev_src, max_block_edges=block)
+    del rev_src
+
+    perm = np.argsort(height, kind="stable")
+    rank = np.empty(n, dtype=np.int64)
+    rank[perm] = np.arange(n, dtype=np.int64)
+
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(_chunked_bincount(sources, n, block, remap=rank), out=indptr[1:])
+    indices = _open_raw(os.path.join(directory, "csr_indices.raw"), "<i8", m, "w+")
+    out_weights = _open_raw(os.path.join(directory, "csr_weights.raw"), "<f8", m, "w+")
+    _scatter_by_key(sources, indptr, [(targets, indices), (weights, out_weights)], block, remap=rank)
+    for start in range(0, m, block):
+        indices[start:start + block] = rank[np.asarray(indices[start:start + block])]
+
+    # Sort each node's out-edges by head and drop repeated heads (last weight
+    # wins), compacting in place: the write cursor never passes the read cursor.
+    degree = np.zeros(n, dtype=np.int64)
+    write = 0
+    lo = 0
+    while lo < n:
+        hi = max(lo + 1, int(np.searchsorted(indptr, indptr[lo] + block, side="right")) - 1)
+        hi = min(hi, n)
+        e_lo, e_hi = int(indptr[lo]), int(indptr[hi])
+        tails = np.repeat(np.arange(lo, hi, dtype=np.int64), np.diff(indptr[lo:hi + 1]))
+        heads = np.asarray(indices[e_lo:e_hi])
+        w = np.asarray(out_weights[e_lo:e_hi])
+        order = np.lexsort((heads, tails))
+        tails, heads, w = tails[order], heads[order], w[order]
+        if tails.size:
+            last = np.ones(tails.size, dtype=bool)
+            last[:-1] = (tails[1:] != tails[:-1]) | (heads[1:] != heads[:-1])
+            tails, heads, w = tails[last], heads[last], w[last]
+        indices[write:write + heads.size] = heads
+        out_weights[write:write + heads.size] = w
+        degree[lo:hi] = np.bincount(tails - lo, minlength=hi - lo)
+        write += heads.size
+        lo = hi
+
+    np.cumsum(degree, out=indptr[1:])
+    level_ptr = np.zeros(int(height.max(initial=-1)) + 2, dtype=np.int64)
+    np.cumsum(np.bincount(height, minlength=level_ptr.shape[0] - 1), out=level_ptr[1:])
+    return CompiledDAG(
+        nodes=tuple(nodes[i] for i in perm),
+        indptr=indptr,
+        indices=indices[:write],
+        weights=out_weights[:write],
+        level_ptr=level_ptr,
+    )
+
+
+def ingest_edge_list(
+    path: str,
+    out_path: str,
+    fmt: Optional[str] = None,
+    source: Optional[Any] = None,
+    sink: Optional[Any] = None,
+    chunk_edges: int = DEFAULT_CHUNK_EDGES,
+    weight: str = "weight",
+    work_dir: Optional[str] = None,
+) -> Tuple[CompiledDAG, Optional[Any], Optional[Any]]:
+    """Stream an edge list into the binary DAG format and memory-map the result.
+
+    Edges are parsed ``chunk_edges`` at a time, interned to integer ids and
+    spilled to raw arrays in a temporary directory (next to ``out_path`` unless
+    ``work_dir`` is given); heights, CSR order and deduplication are then done
+    out of core by compile_edge_arrays_external. No networkx graph is built and
+    only the label table and O(n_nodes) arrays stay in memory. ``source`` and
+    ``sink`` override those recorded in a JSON file. Returns
+    load_binary_dag(out_path): (compiled, source, sink), with the edge arrays
+    memory-mapped, ready for the ``max_block_edges`` DP engines.
+    """
+    reader = EdgeListReader(path, fmt=fmt, chunk_edges=chunk_edges, weight=weight)
+    work_root = work_dir or os.path.dirname(os.path.abspath(out_path))
+    with tempfile.TemporaryDirectory(dir=work_root) as work:
+        spill = _Spill(work, {"sources": "<i8", "targets": "<i8", "weights": "<f8"})
+        index: Dict[Any, int] = {}
+        with instrumentation.phase("ingest.parse"):
+            for chunk in reader:
+                for node in chunk.nodes:
+                    index.setdefault(node, len(index))
+                src = np.empty(len(chunk), dtype=np.int64)
+                dst = np.empty(len(chunk), dtype=np.int64)
+                for i, (u, v) in enumerate(zip(chunk.tails, chunk.heads)):
+                    src[i] = index.setdefault(u, len(index))
+                    dst[i] = index.setdefault(v, len(index))
+                spill.append(sources=src, targets=dst, weights=chunk.weights)
+            edges = spill.close()
+        instrumentation.count("edges", spill.count)
+
+        with instrumentation.phase("ingest.compile"):
+            compiled = compile_edge_arrays_external(list(index), max_block_edges=chunk_edges, directory=work, **edges)
+        source = reader.source if source is None else source
+        sink = reader.sink if sink is None else sink
+        with instrumentation.phase("ingest.write"):
+            write_binary_dag(compiled, out_path, source=source, sink=sink)
+        del compiled, edges
+    return load_binary_dag(out_path, mmap=True)
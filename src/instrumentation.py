@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional
+
+# Opt-in profiling for the src engines. While no profile is active, phase()
+# returns a shared null context and count() returns after one global lookup,
+# so instrumented hot paths pay essentially nothing.
+
+_active: Optional["Profile"] = None
+_NULL = nullcontext()
+
+
+@dataclass(frozen=True)
+class PhaseRecord:
+    name: str
+    start_ns: int
+    duration_ns: int
+    thread_id: int
+
+
+@dataclass
+class Profile:
+    """Phase timings and counters collected while a profile() block is active."""
+
+    phases: List[PhaseRecord] = field(default_factory=list)
+    counters: Counter = field(default_factory=Counter)
+    origin_ns: int = field(default_factory=time.perf_counter_ns)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += n
+
+    def record(self, name: str, start_ns: int, end_ns: int) -> None:
+        with self._lock:
+            self.phases.append(PhaseRecord(name, start_ns - self.origin_ns, end_ns - start_ns, threading.get_ident()))
+
+    def totals(self) -> Dict[str, Dict[str, float]]:
+        """Per-phase {"calls", "total_s"} aggregated over all records."""
+        out: Dict[str, Dict[str, float]] = {}
+        for rec in self.phases:
+            entry = out.setdefault(rec.name, {"calls": 0, "total_s": 0.0})
+            entry["calls"] += 1
+            entry["total_s"] += rec.duration_ns * 1e-9
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "phases": [
+                {"name": r.name, "start_s": r.start_ns * 1e-9, "duration_s": r.duration_ns * 1e-9, "thread": r.thread_id}
+                for r in self.phases
+            ],
+            "totals": self.totals(),
+            "counters": dict(self.counters),
+        }
+
+    def to_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Trace Event Format (chrome://tracing, Perfetto): one complete event per
+        phase plus the final counter values."""
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = [
+            {"name": r.name, "ph": "X", "ts": r.start_ns / 1e3, "dur": r.duration_ns / 1e3, "pid": pid, "tid": r.thread_id}
+            for r in self.phases
+        ]
+        end_us = max((e["ts"] + e["dur"] for e in events), default=0.0)
+        events += [
+            {"name": name, "ph": "C", "ts": end_us, "pid": pid, "args": {name: value}}
+            for name, value in sorted(self.counters.items())
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def to_chrome_trace(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+class _Phase:
+    __slots__ = ("profile", "name", "start")
+
+    def __init__(self, profile: Profile, name: str) -> None:
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter_ns()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.profile.record(self.name, self.start, time.perf_counter_ns())
+
+
+def enabled() -> bool:
+    return _active is not None
+
+
+def phase(name: str) -> ContextManager[None]:
+    """Time the enclosed block as ``name`` when profiling is on."""
+    if _active is None:
+        return _NULL
+    return _Phase(_active, name)
+
+
+def count(name: str, n: int = 1) -> None:
+    """Add ``n`` to counter ``name`` when profiling is on."""
+    if _active is not None:
+        _active.add(name, n)
+
+
+@contextmanager
+def profile(callback: Optional[Callable[[Profile], None]] = None) -> Iterator[Profile]:
+    """Collect phases and counters from every src engine call made in the block.
+
+    Profiles are process-wide (worker threads of the parallel engines report
+    into the same one); nested blocks shadow the outer one until they exit.
+    ``callback`` receives the finished profile, e.g. to ship it to a logger.
+    """
+    global _active
+    previous = _active
+    current = Profile()
+    _active = current
+    try:
+        yield current
+    finally:
+        _active = previous
+        if callback is not None:
+            callback(current)
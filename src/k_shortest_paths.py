@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import heapq
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from . import instrumentation
+from ._lazy import lazy_module
+
+nx = lazy_module("networkx")
+
+# A sidetrack record is (tail, head, parent record); None is the shortest path itself.
+_Sidetrack = Optional[Tuple[Any, Any, Any]]
+
+
+def _distances_to_target(
+    graph: nx.DiGraph,
+    target: Any,
+    weight: str,
+) -> Tuple[Dict[Any, float], Dict[Any, Any]]:
+    dist: Dict[Any, float] = {node: float("inf") for node in graph.nodes}
+    succ: Dict[Any, Any] = {}
+    dist[target] = 0.0
+    for v in reversed(list(nx.topological_sort(graph))):
+        if v == target:
+            continue
+        for _, u, data in graph.out_edges(v, data=True):
+            c = float(data.get(weight, 1.0)) + dist[u]
+            if c < dist[v]:
+                dist[v] = c
+                succ[v] = u
+    return dist, succ
+
+
+def _rebuild_path(source: Any, target: Any, succ: Dict[Any, Any], rec: _Sidetrack) -> List[Any]:
+    sidetracks = []
+    while rec is not None:
+        sidetracks.append((rec[0], rec[1]))
+        rec = rec[2]
+    path = [source]
+    for tail, head in reversed(sidetracks):
+        while path[-1] != tail:
+            path.append(succ[path[-1]])
+        path.append(head)
+    while path[-1] != target:
+        path.append(succ[path[-1]])
+    return path
+
+
+def iter_path_costs_sorted(
+    graph: nx.DiGraph,
+    source: Any,
+    target: Any,
+    weight: str = "weight",
+    max_cost: float | None = None,
+    max_paths: int | None = None,
+    return_paths: bool = False,
+) -> Iterator[Union[float, Tuple[float, List[Any]]]]:
+    """Yield s->t path costs on a DAG in non-decreasing order (Eppstein-style).
+
+    Each path is stored as its sidetracks (non-tree edges) off the shortest-path
+    tree to ``target``, sharing parent records, so a heap entry costs O(1)
+    memory. Stops after ``max_paths`` paths or once costs exceed ``max_cost``;
+    with ``max_paths`` the heap is also trimmed to the remaining budget. With
+    ``return_paths`` yields ``(cost, path)`` pairs. Costs are accumulated from
+    sidetrack slacks and may differ from a left-to-right sum by rounding.
+    """
+    if not nx.is_directed_acyclic_graph(graph):
+        raise ValueError("iter_path_costs_sorted expects a DAG")
+    if max_paths is not None and max_paths <= 0:
+        return
+
+    dist, succ = _distances_to_target(graph, target, weight)
+    if dist[source] == float("inf"):
+        return
+
+    counter = 0
+    heap: List[Tuple[float, int, Any, _Sidetrack]] = [(dist[source], counter, source, None)]
+    emitted = 0
+    while heap:
+        cost, _, start, rec = heapq.heappop(heap)
+        if max_cost is not None and cost > max_cost:
+            return
+        if return_paths:
+            yield cost, _rebuild_path(source, target, succ, rec)
+        else:
+            yield cost
+        emitted += 1
+        instrumentation.count("paths_enumerated")
+        if max_paths is not None and emitted >= max_paths:
+            return
+
+        x = start
+        while x != target:
+            for _, z, data in graph.out_edges(x, data=True):
+                if z == succ[x] or dist[z] == float("inf"):
+                    continue
+                slack = max(0.0, float(data.get(weight, 1.0)) + dist[z] - dist[x])
+                child = cost + slack
+                if max_cost is not None and child > max_cost:
+                    continue
+                counter += 1
+                heapq.heappush(heap, (child, counter, z, (x, z, rec)))
+            x = succ[x]
+
+        if max_paths is not None and len(heap) > 2 * (max_paths - emitted):
+            heap = heapq.nsmallest(max_paths - emitted, heap)
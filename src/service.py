@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+
+from ._lazy import lazy_module
+from .classical_shortest_path import iter_shortest_path_value_blocks
+from .compiled import CompiledDAG, compile_dag
+from .entropy_regularized import soft_values_pairs
+from .graph import DAG
+
+nx = lazy_module("networkx")
+
+# A query is (kind, source, target, temperature); hard queries carry None.
+Query = Tuple[str, Any, Any, Optional[float]]
+
+
+def solve_batch(
+    compiled: CompiledDAG,
+    queries: Sequence[Query],
+    block_size: int = 16,
+    max_block_edges: Optional[int] = None,
+) -> List[float]:
+    """Answer a mixed batch of ``("soft", s, t, T)`` and ``("hard", s, t, None)`` queries.
+
+    Distinct (target, T) pairs share one soft sweep and distinct hard targets
+    one hard sweep, however many sources ask about them. Sweeps run
+    ``block_size`` pairs (or targets) at a time and keep only the queried
+    sources, so memory is bounded by ``block_size * n_nodes`` values (plus
+    ``block_size * max_block_edges`` per level, see backward_sweep) whatever
+    the batch size.
+    """
+    if block_size <= 0:
+        raise ValueError("block_size must be positive")
+    sources = [compiled.node_id(source) for _, source, _, _ in queries]
+    soft_pairs: Dict[Tuple[Any, float], List[int]] = {}
+    hard_targets: Dict[Any, List[int]] = {}
+    for i, (kind, _, target, temperature) in enumerate(queries):
+        if kind == "soft":
+            soft_pairs.setdefault((target, temperature), []).append(i)
+        else:
+            hard_targets.setdefault(target, []).append(i)
+
+    results = [0.0] * len(queries)
+    pairs = list(soft_pairs)
+    for start in range(0, len(pairs), block_size):
+        block = pairs[start:start + block_size]
+        targets, temps = zip(*block)
+        values = soft_values_pairs(compiled, targets, np.array(temps, dtype=np.float64), max_block_edges)
+        for row, pair in enumerate(block):
+            for i in soft_pairs[pair]:
+                results[i] = float(values[row, sources[i]])
+    for block, values in iter_shortest_path_value_blocks(compiled, list(hard_targets), block_size, max_block_edges):
+        for col, target in enumerate(block):
+            for i in hard_targets[target]:
+                results[i] = float(values[sources[i], col])
+    return results
+
+
+@dataclass
+class _Pending:
+    query: Query
+    future: asyncio.Future
+
+
+class ShortestPathService:
+    """asyncio front end that micro-batches soft/hard point queries per graph.
+
+    Queries on the same registered graph that arrive within ``batch_window``
+    seconds (or until ``max_batch`` are queued) are answered by one batched DP
+    (see solve_batch) run in ``executor`` (the loop's default pool if None), so
+    the event loop never blocks on a sweep. At most ``max_in_flight`` queries
+    may be queued or running; further callers wait, which is the backpressure.
+    Cancelling a caller drops its query; a batch whose callers were all
+    cancelled before it started is skipped. ``block_size`` and
+    ``max_block_edges`` bound each batch's sweep memory (see solve_batch).
+
+    Use as ``async with ShortestPathService() as service:`` or call close().
+    """
+
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        batch_window: float = 0.002,
+        max_batch: int = 256,
+        max_in_flight: int = 1024,
+        block_size: int = 16,
+        max_block_edges: Optional[int] = None,
+    ) -> None:
+        if max_batch <= 0 or max_in_flight <= 0 or block_size <= 0:
+            raise ValueError("max_batch, max_in_flight and block_size must be positive")
+        self.executor = executor
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_in_flight = max_in_flight
+        self.block_size = block_size
+        self.max_block_edges = max_block_edges
+        self._graphs: Dict[Hashable, CompiledDAG] = {}
+        self._pending: Dict[Hashable, List[_Pending]] = {}
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.batches_run = 0
+
+    async def __aenter__(self) -> "ShortestPathService":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    def register(self, key: Hashable, graph: Union[DAG, nx.DiGraph, CompiledDAG], weight: str = "weight") -> None:
+        """Compile ``graph`` once and serve queries for it under ``key``."""
+        self._graphs[key] = graph if isinstance(graph, CompiledDAG) else compile_dag(graph, weight=weight)
+
+    async def soft_value(self, key: Hashable, source: Any, target: Any, temperature: float) -> float:
+        """d_T(source) towards ``target`` on the graph registered as ``key``."""
+        if temperature <= 0:
+            raise ValueError("temperature must be positive")
+        return await self._submit(key, ("soft", source, target, float(temperature)))
+
+    async def hard_value(self, key: Hashable, source: Any, target: Any) -> float:
+        """d*(source) towards ``target`` (inf when unreachable)."""
+        return await self._submit(key, ("hard", source, target, None))
+
+    async def _submit(self, key: Hashable, query: Query) -> float:
+        compiled = self._graph(key)
+        compiled.node_id(query[1])
+        compiled.node_id(query[2])
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+
+        async with self._slots:
+            future = asyncio.get_running_loop().create_future()
+            batch = self._pending.setdefault(key, [])
+            batch.append(_Pending(query, future))
+            if len(batch) >= self.max_batch:
+                self._flush(key)
+            elif key not in self._timers:
+                self._timers[key] = asyncio.get_running_loop().call_later(self.batch_window, self._flush, key)
+            return await future
+
+    def _graph(self, key: Hashable) -> CompiledDAG:
+        try:
+            return self._graphs[key]
+        except KeyError:
+            raise ValueError(f"graph {key!r} is not registered") from None
+
+    def _flush(self, key: Hashable) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, [])
+        if batch:
+            task = asyncio.ensure_future(self._run(self._graphs[key], batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, compiled: CompiledDAG, batch: List[_Pending]) -> None:
+        live = [p for p in batch if not p.future.done()]
+        if not live:
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(
+                self.executor,
+                solve_batch,
+                compiled,
+                [p.query for p in live],
+                self.block_size,
+                self.max_block_edges,
+            )
+        except Exception as exc:
+            # Delivered to every caller in the batch.
+            for p in live:
+                if not p.future.done():
+                    p.future.set_exception(exc)
+            return
+        self.batches_run += 1
+        for p, value in zip(live, results):
+            if not p.future.done():
+                p.future.set_result(value)
+
+    async def close(self) -> None:
+        """Run every queued batch and wait for the batches in flight."""
+        for key in list(self._pending):
+            self._flush(key)
+        if self._tasks:
+            await asyncio.gather(*self._tasks)
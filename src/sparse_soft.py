@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from ._lazy import lazy_module
+from .compiled import CompiledDAG, compile_dag, concat_ranges, segment_logsumexp
+
+nx = lazy_module("networkx")
+sp = lazy_module("scipy.sparse")
+
+# Row sums below this have lost most of their mantissa to underflow.
+_TINY = np.finfo(np.float64).tiny * 2.0**52
+
+
+@dataclass(frozen=True)
+class _Layer:
+    lo: int
+    hi: int
+    e_lo: int
+    e_hi: int
+    cols: np.ndarray
+    pattern: sp.csr_matrix
+
+
+class SparseSoftEngine:
+    """Soft Bellman recursion as level-wise sparse mat-vecs in the (+, x) semiring.
+
+    For level ``k`` with edge matrix ``A_k = exp(-(W - rowmin W) / T)`` (built once
+    per temperature) and child values shifted by their minimum ``m``,
+    ``Z = A_k @ exp(-(d_T(children) - m) / T)`` and
+    ``d_T(v) = rowmin_v + m - T log Z_v``. Rows whose sum underflows fall back
+    to an exact segment log-sum-exp.
+    """
+
+    def __init__(self, compiled: CompiledDAG, max_cached_temperatures: int = 4) -> None:
+        self.compiled = compiled
+        self.max_cached_temperatures = max_cached_temperatures
+        self._layers: List[_Layer] = []
+        self._rowmin = np.zeros(compiled.n_nodes)
+        for level in range(1, compiled.n_levels):
+            lo, hi, e_lo, e_hi = compiled.level_bounds(level)
+            heads = compiled.indices[e_lo:e_hi]
+            cols, local = np.unique(heads, return_inverse=True)
+            indptr = compiled.indptr[lo:hi + 1] - e_lo
+            pattern = sp.csr_matrix((np.ones(e_hi - e_lo), local, indptr), shape=(hi - lo, cols.shape[0]))
+            self._layers.append(_Layer(lo, hi, e_lo, e_hi, cols, pattern))
+            self._rowmin[lo:hi] = np.minimum.reduceat(compiled.weights[e_lo:e_hi], indptr[:-1])
+        self._matrices: Dict[float, List[sp.csr_matrix]] = {}
+
+    def _level_matrices(self, temperature: float) -> List[sp.csr_matrix]:
+        if temperature not in self._matrices:
+            if len(self._matrices) >= self.max_cached_temperatures:
+                self._matrices.pop(next(iter(self._matrices)))
+            tails_min = np.repeat(self._rowmin, np.diff(self.compiled.indptr))
+            data = np.exp(-(self.compiled.weights - tails_min) / temperature)
+            mats = []
+            for layer in self._layers:
+                a = layer.pattern.copy()
+                a.data = data[layer.e_lo:layer.e_hi]
+                mats.append(a)
+            self._matrices[temperature] = mats
+        return self._matrices[temperature]
+
+    def values(self, target: Any, temperature: float) -> np.ndarray:
+        """Return d_T(v) for every compiled node id (same as soft_values_compiled)."""
+        if temperature <= 0:
+            raise ValueError("temperature must be positive")
+        compiled = self.compiled
+        t = compiled.node_id(target)
+        dT = np.full(compiled.n_nodes, np.inf)
+        dT[t] = 0.0
+
+        for layer, a in zip(self._layers, self._level_matrices(temperature)):
+            child = dT[layer.cols]
+            live = np.isfinite(child)
+            out = np.full(layer.hi - layer.lo, np.inf)
+            if live.any():
+                m = child[live].min()
+                z = np.zeros(child.shape[0])
+                z[live] = np.exp(-(child[live] - m) / temperature)
+                total = a @ z
+                ok = total >= _TINY
+                out[ok] = self._rowmin[layer.lo:layer.hi][ok] + m - temperature * np.log(total[ok])
+                rescue = ~ok & (layer.pattern @ live.astype(np.float64) > 0)
+                if rescue.any():
+                    out[rescue] = self._exact_rows(layer, np.flatnonzero(rescue), dT, temperature)
+            dT[layer.lo:layer.hi] = out
+            if layer.lo <= t < layer.hi:
+                dT[t] = 0.0
+
+        return dT
+
+    def _exact_rows(self, layer: _Layer, rows: np.ndarray, dT: np.ndarray, temperature: float) -> np.ndarray:
+        indptr = self.compiled.indptr
+        starts = indptr[layer.lo + rows]
+        ends = indptr[layer.lo + rows + 1]
+        edges = concat_ranges(starts, ends)
+        costs = self.compiled.weights[edges] + dT[self.compiled.indices[edges]]
+        seg = np.cumsum(ends - starts) - (ends - starts)
+        return -temperature * segment_logsumexp(-costs / temperature, seg)
+
+
+def soft_shortest_path_sparse(
+    graph: nx.DiGraph,
+    source: Any,
+    target: Any,
+    temperature: float,
+    weight: str = "weight",
+) -> Tuple[float, Dict[Any, float]]:
+    """scipy.sparse counterpart of soft_shortest_path_dag with the same return value."""
+    compiled = compile_dag(graph, weight=weight)
+    values = SparseSoftEngine(compiled).values(target, temperature)
+    return float(values[compiled.node_id(source)]), compiled.to_dict(values)
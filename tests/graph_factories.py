@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from typing import Callable, Optional, Type
+
+import networkx as nx
+import numpy as np
+
+from src.graph import DAG
+
+# Seeded random DAGs shared by the test modules (imported as a sibling module).
+
+
+def generate_random_dag(
+    rng: np.random.Generator,
+    n: int,
+    p: float,
+    low: float = 0.1,
+    high: float = 5.0,
+    weight: Optional[Callable[[np.random.Generator], float]] = None,
+) -> nx.DiGraph:
+    """Nodes 0..n-1 with each forward pair i < j joined with probability ``p``.
+
+    Weights are uniform on [low, high) unless ``weight`` draws them from ``rng``.
+    """
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(n))
+    for i in range(n - 1):
+        for j in range(i + 1, n):
+            if rng.random() < p:
+                w = weight(rng) if weight is not None else float(rng.uniform(low, high))
+                graph.add_edge(i, j, weight=w)
+    return graph
+
+
+def to_dag(graph: nx.DiGraph, cls: Type[DAG] = DAG) -> DAG:
+    """Copy ``graph`` into a DAG wrapper (or subclass), keeping insertion order."""
+    dag = cls()
+    for node in graph.nodes:
+        dag.add_node(node)
+    for u, v, w in graph.edges(data="weight"):
+        dag.add_edge(u, v, w)
+    return dag
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import networkx as nx
+
+from benchmarks.graph_families import FAMILIES, make_case
+from benchmarks.run_benchmarks import ENGINES, compare, run_suite
+
+
+def test_graph_families_are_seeded_dags() -> None:
+    for family in FAMILIES:
+        case = make_case(family, 500, seed=1)
+        graph = case.to_networkx()
+        assert nx.is_directed_acyclic_graph(graph)
+        assert nx.has_path(graph, case.source, case.target)
+        assert graph.number_of_edges() == case.n_edges
+        assert 250 <= case.n_edges <= 1000
+        again = make_case(family, 500, seed=1)
+        assert (again.weights == case.weights).all()
+
+
+def test_suite_records_every_engine_and_flags_regressions() -> None:
+    results = run_suite(["parallel"], [200], list(ENGINES), [0.5], repeat=1)
+    assert {row["engine"] for row in results} == set(ENGINES)
+    for row in results:
+        assert row["wall_time"] > 0
+        assert row["edges_per_second"] > 0
+        assert row["peak_memory_bytes"] >= 0
+
+    assert compare(results, results) == []
+    slower = [{**row, "wall_time": row["wall_time"] * 10 + 1.0} for row in results]
+    assert len(compare(slower, results, threshold=1.5)) == len(results)
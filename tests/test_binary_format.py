@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+
+from src.binary_format import convert_json_to_binary, load_binary_dag, write_binary_dag
+from src.compiled import compile_dag
+from src.entropy_regularized import soft_shortest_path_dag, soft_values_compiled
+from src.graph import load_dag_from_json
+
+
+def test_json_conversion_round_trip(tmp_path) -> None:
+    out = str(tmp_path / "sample.dagb")
+    convert_json_to_binary("data/sample_dag.json", out)
+    dag = load_dag_from_json("data/sample_dag.json")
+
+    for mmap in (True, False):
+        compiled, source, sink = load_binary_dag(out, mmap=mmap)
+        assert (source, sink) == (dag.source, dag.sink)
+        assert not compiled.weights.flags.writeable
+        expected, _ = soft_shortest_path_dag(dag.to_networkx(), source, sink, 0.5)
+        values = soft_values_compiled(compiled, sink, 0.5)
+        assert abs(values[compiled.node_id(source)] - expected) <= 1e-12
+
+
+def test_integer_labels_are_mapped(tmp_path) -> None:
+    rng = np.random.default_rng(0)
+    edges = []
+    for i in range(40):
+        for j in range(i + 1, 40):
+            if rng.random() < 0.2:
+                edges.append([i, j, float(rng.uniform(0.1, 2.0))])
+    edges.append([0, 39, 5.0])
+    src = tmp_path / "random.json"
+    src.write_text(json.dumps({"nodes": list(range(40)), "edges": edges, "source": 0, "sink": 39}))
+
+    out = str(tmp_path / "random.dagb")
+    reference = convert_json_to_binary(str(src), out)
+    compiled, source, sink = load_binary_dag(out)
+    assert isinstance(compiled.nodes, np.memmap)
+    assert list(compiled.nodes) == list(reference.nodes)
+    assert np.array_equal(compiled.indptr, reference.indptr)
+    assert np.array_equal(soft_values_compiled(compiled, sink, 0.3), soft_values_compiled(reference, sink, 0.3))
+
+    rewritten = str(tmp_path / "rewritten.dagb")
+    write_binary_dag(compile_dag(load_dag_from_json(str(src))), rewritten, source=0, sink=39)
+    again, _, _ = load_binary_dag(rewritten)
+    assert np.array_equal(again.weights, reference.weights)
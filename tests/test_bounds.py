@@ -4,8 +4,14 @@ import math
 
 import networkx as nx
 import numpy as np
+import pytest
 
-from src.bounds import compute_path_stats, enumerate_path_costs, theorem_iii_1_upper_bound
+from src.bounds import (
+    compute_path_stats,
+    enumerate_path_costs,
+    theorem_iii_1_upper_bound,
+    theorem_iii_1_upper_bound_array,
+)
 from src.classical_shortest_path import shortest_path_cost
 from src.entropy_regularized import soft_shortest_path, soft_shortest_path_dag
 from src.graph import load_dag_from_json
@@ -63,3 +69,38 @@ def test_single_path_dag_soft_equals_hard() -> None:
     d_star = shortest_path_cost(graph, "s", "t")
     dT, _ = soft_shortest_path(graph, "s", "t", 0.3)
     assert abs(dT - d_star) <= 1e-12
+
+
+def test_bound_array_broadcasts_and_matches_scalar() -> None:
+    temps = np.logspace(-2, 1, 7)[:, None, None]
+    n_subs = np.array([0, 1, 5, 1000])[None, :, None]
+    deltas = np.array([0.0, 0.3, 2.0])[None, None, :]
+    grid = theorem_iii_1_upper_bound_array(temps, n_subs, deltas)
+    assert grid.shape == (7, 4, 3)
+    for i, T in enumerate(temps.ravel()):
+        for j, n in enumerate(n_subs.ravel()):
+            for k, d in enumerate(deltas.ravel()):
+                expected = theorem_iii_1_upper_bound(float(T), int(n), float(d))
+                assert grid[i, j, k] == pytest.approx(expected, rel=1e-12, abs=1e-300)
+
+
+def test_bound_array_log_count_handles_huge_counts() -> None:
+    log_n = np.array([-np.inf, 0.0, 5000.0])
+    got = theorem_iii_1_upper_bound_array(0.01, log_n, 1.0, log_count=True)
+    assert got[0] == 0.0
+    assert got[1] == pytest.approx(theorem_iii_1_upper_bound(0.01, 1, 1.0), rel=1e-12)
+    assert got[2] == pytest.approx(0.01 * (5000.0 - 100.0), rel=1e-12)
+    plain = theorem_iii_1_upper_bound_array(0.5, np.array([3.0, 40.0]), 0.2)
+    logged = theorem_iii_1_upper_bound_array(0.5, np.log([3.0, 40.0]), 0.2, log_count=True)
+    assert np.allclose(plain, logged, rtol=1e-14, atol=0.0)
+
+
+def test_bound_array_validates_elementwise() -> None:
+    with pytest.raises(ValueError):
+        theorem_iii_1_upper_bound_array([0.5, 0.0], 1, 0.1)
+    with pytest.raises(ValueError):
+        theorem_iii_1_upper_bound_array(0.5, [1, -1], 0.1)
+    with pytest.raises(ValueError):
+        theorem_iii_1_upper_bound_array(0.5, 1, [0.1, -0.1])
+    with pytest.raises(ValueError):
+        theorem_iii_1_upper_bound_array(0.5, np.nan, 0.1, log_count=True)
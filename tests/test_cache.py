@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import networkx as nx
+import numpy as np
+
+from src.bounds import compute_path_stats
+from src.cache import (
+    ResultCache,
+    cached_compute_path_stats,
+    cached_soft_shortest_path,
+    cached_topological_order,
+    graph_fingerprint,
+)
+from src.entropy_regularized import soft_shortest_path
+from src.graph import DAG, load_dag_from_json
+
+
+def test_fingerprint_tracks_structure_and_weights() -> None:
+    graph = nx.DiGraph()
+    graph.add_edge("s", "a", weight=1.0)
+    graph.add_edge("a", "t", weight=1.0)
+    before = graph_fingerprint(graph)
+    assert graph_fingerprint(graph.copy()) == before
+    graph["a"]["t"]["weight"] = 1.5
+    assert graph_fingerprint(graph) != before
+    graph["a"]["t"]["weight"] = 1.0
+    graph.add_node("x")
+    assert graph_fingerprint(graph) != before
+
+
+def test_cached_results_match_and_hit() -> None:
+    cache = ResultCache()
+    dag = load_dag_from_json("data/sample_dag.json")
+    graph = dag.to_networkx()
+
+    expected, expected_all = soft_shortest_path(graph, "s", "t", 0.5)
+    for _ in range(3):
+        value, values = cached_soft_shortest_path(dag, "s", "t", 0.5, cache=cache)
+        assert abs(value - expected) <= 1e-12
+        assert values.keys() == expected_all.keys()
+    assert cached_compute_path_stats(graph, "s", "t", cache=cache) == compute_path_stats(graph, "s", "t")
+    cached_compute_path_stats(graph, "s", "t", cache=cache)
+    assert cache.hits >= 5
+
+    order = cached_topological_order(dag, cache=cache)
+    position = {node: i for i, node in enumerate(order)}
+    assert all(position[u] < position[v] for u, v in graph.edges)
+
+
+def test_dag_mutation_invalidates_entries() -> None:
+    cache = ResultCache()
+    dag = DAG()
+    dag.add_edge("s", "a", 1.0)
+    dag.add_edge("a", "t", 1.0)
+    first, _ = cached_soft_shortest_path(dag, "s", "t", 0.5, cache=cache)
+    assert len(cache) == 2
+
+    dag.add_edge("s", "t", 1.0)
+    second, _ = cached_soft_shortest_path(dag, "s", "t", 0.5, cache=cache)
+    assert second < first
+    assert len(cache) == 2
+    assert abs(second - soft_shortest_path(dag.to_networkx(), "s", "t", 0.5)[0]) <= 1e-12
+
+
+def test_byte_budget_and_disk_store(tmp_path) -> None:
+    cache = ResultCache(max_bytes=3000, directory=str(tmp_path))
+    for i in range(10):
+        cache.put(("array", "fp", i), np.zeros(100))
+    assert cache.nbytes <= 3000
+    assert ("array", "fp", 0) not in cache
+    assert ("array", "fp", 9) in cache
+
+    restored = ResultCache(directory=str(tmp_path))
+    assert np.array_equal(restored.get(("array", "fp", 0)), np.zeros(100))
+    assert restored.get(("array", "fp", 42)) is None
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from src.classical_shortest_path import (
+    dag_shortest_path,
+    dag_shortest_path_lengths,
+    dijkstra_shortest_path_length,
+    shortest_path_cost,
+)
+from graph_factories import generate_random_dag
+
+
+def test_dag_engine_matches_bellman_ford_with_negative_costs() -> None:
+    rng = np.random.default_rng(0)
+    for _ in range(30):
+        graph = generate_random_dag(rng, int(rng.integers(3, 20)), float(rng.uniform(0.2, 0.6)), low=-1.0, high=2.0)
+        target = max(graph.nodes)
+        d_star, next_hop = dag_shortest_path_lengths(graph, target)
+        for node in graph.nodes:
+            if node != target and nx.has_path(graph, node, target):
+                expected = nx.bellman_ford_path_length(graph, node, target)
+                assert abs(d_star[node] - expected) <= 1e-12
+                path = dag_shortest_path(graph, node, target)
+                cost = sum(graph[u][v]["weight"] for u, v in zip(path[:-1], path[1:]))
+                assert abs(cost - d_star[node]) <= 1e-12
+                assert next_hop[node] == path[1]
+            elif node != target:
+                assert np.isinf(d_star[node])
+                assert node not in next_hop
+
+
+def test_shortest_path_cost_matches_dijkstra() -> None:
+    rng = np.random.default_rng(1)
+    for _ in range(30):
+        graph = generate_random_dag(rng, int(rng.integers(3, 20)), float(rng.uniform(0.2, 0.6)), low=0.1, high=2.0)
+        target = max(graph.nodes)
+        if not nx.has_path(graph, 0, target):
+            with pytest.raises(nx.NetworkXNoPath):
+                shortest_path_cost(graph, 0, target)
+            continue
+        expected = dijkstra_shortest_path_length(graph, 0, target)
+        assert abs(shortest_path_cost(graph, 0, target) - expected) <= 1e-12
+
+
+def test_shortest_path_cost_unknown_nodes_raise_node_not_found() -> None:
+    graph = nx.DiGraph()
+    graph.add_edge("s", "t", weight=1.0)
+    for source, target in [("x", "t"), ("s", "x")]:
+        with pytest.raises(nx.NodeNotFound):
+            shortest_path_cost(graph, source, target)
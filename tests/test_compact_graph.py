@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import copy
+import pickle
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from src.bounds import compute_path_stats
+from src.cache import ResultCache, cached_compute_path_stats, cached_soft_shortest_path
+from src.classical_shortest_path import shortest_path_cost
+from src.compiled import compile_dag
+from src.entropy_regularized import soft_shortest_path_dag
+from src.graph import CompactDAG, DAG, Edge
+from graph_factories import generate_random_dag, to_dag
+
+
+def build_pair(seed: int, n: int = 30, p: float = 0.25):
+    graph = generate_random_dag(np.random.default_rng(seed), n, p)
+    dag, compact = to_dag(graph), to_dag(graph, CompactDAG)
+    for graph in (dag, compact):
+        graph.add_edge(0, n - 1, 10.0)
+        graph.set_source_sink(0, n - 1)
+    return dag, compact
+
+
+def test_compact_dag_matches_networkx_backed_dag() -> None:
+    dag, compact = build_pair(0)
+    assert nx.utils.graphs_equal(compact.to_networkx(), dag.to_networkx())
+    assert sorted(compact.edges(), key=lambda e: (e.u, e.v)) == sorted(dag.edges(), key=lambda e: (e.u, e.v))
+    assert compact.nodes() == dag.nodes()
+    assert compact.reaches_sink() == dag.reaches_sink()
+    assert sorted(map(sorted, compact.depth_layers())) == sorted(map(sorted, dag.depth_layers()))
+
+    order = compact.topological_order()
+    position = {v: i for i, v in enumerate(order)}
+    assert all(position[e.u] < position[e.v] for e in compact.edge_view())
+
+    a, b = compile_dag(dag), compile_dag(compact)
+    assert a.nodes == b.nodes
+    assert np.array_equal(a.indptr, b.indptr) and np.array_equal(a.weights, b.weights)
+    value, values = soft_shortest_path_dag(compact, 0, 29, 0.5)
+    ref_value, ref_values = soft_shortest_path_dag(dag, 0, 29, 0.5)
+    assert value == pytest.approx(ref_value, rel=1e-12)
+    assert values.keys() == ref_values.keys()
+    assert all(values[v] == pytest.approx(ref_values[v], rel=1e-12) for v in values)
+    assert compute_path_stats(compact, 0, 29) == compute_path_stats(dag, 0, 29)
+
+
+def test_duplicate_edges_keep_last_weight_and_mutation_invalidates() -> None:
+    compact = CompactDAG()
+    compact.add_edge("s", "t", 1.0)
+    compact.add_edge("s", "t", 3.0)
+    assert compact.edges() == [Edge("s", "t", 3.0)]
+    assert compact.path_cost(["s", "t"]) == 3.0
+    first = compact.compile()
+    assert compact.compile() is first
+
+    compact.add_edge("t", "s", 1.0)
+    assert not compact.is_acyclic()
+    with pytest.raises(ValueError):
+        compact.topological_order()
+
+
+def test_vectorized_path_costs_match_sequential_sums() -> None:
+    dag, compact = build_pair(1, n=40)
+    graph = dag.to_networkx()
+    paths = [list(p) for _, p in zip(range(50), nx.all_simple_paths(graph, 0, 39))]
+    paths += [[5], [], [0, 39]]
+    expected = np.array([dag.path_cost(p) for p in paths])
+    assert np.array_equal(compact.path_costs(paths), expected)
+    assert np.array_equal(dag.path_costs(paths), expected)
+    assert compact.path_costs([]).shape == (0,)
+
+    with pytest.raises(KeyError):
+        compact.path_costs([[0, 39], [39, 0]])
+    with pytest.raises(KeyError):
+        compact.path_cost([0, "missing"])
+
+
+def test_edge_storage_is_compact() -> None:
+    _, compact = build_pair(2)
+    u, v, w = compact.columns()
+    assert u.dtype == np.int64 and v.dtype == np.int64 and w.dtype == np.float64
+    assert compact._u.itemsize + compact._v.itemsize + compact._w.itemsize == 24
+    assert not hasattr(Edge(0, 1, 1.0), "__dict__")
+    view = compact.edge_view()
+    assert len(view) == u.shape[0]
+    assert view[0] == Edge(compact.nodes()[u[0]], compact.nodes()[v[0]], float(w[0]))
+    assert compact.node_id(compact.nodes()[3]) == 3
+    assert CompactDAG.from_dag(build_pair(2)[0]).edges() == compact.edges()
+
+
+def test_graphs_without_edges() -> None:
+    empty = CompactDAG()
+    assert empty.edges() == [] and empty.nodes() == []
+    assert empty.topological_order() == () and empty.depth_layers() == []
+    assert empty.compile().n_nodes == 0
+
+    isolated, reference = CompactDAG(), DAG()
+    for graph in (isolated, reference):
+        graph.add_node("a")
+        graph.add_node("b")
+    assert isolated.edges() == reference.edges() == []
+    assert sorted(isolated.topological_order()) == ["a", "b"]
+    assert sorted(map(sorted, isolated.depth_layers())) == sorted(map(sorted, reference.depth_layers()))
+    assert isolated.compile().n_edges == 0
+    assert isolated.path_costs([["a"], []]).tolist() == [0.0, 0.0]
+
+
+def test_queries_do_not_build_a_networkx_copy() -> None:
+    dag, compact = build_pair(3)
+    cache = ResultCache()
+    value, _ = soft_shortest_path_dag(compact, 0, 29, 0.5)
+    stats = compute_path_stats(compact, 0, 29)
+    cost = shortest_path_cost(compact, 0, 29)
+    reach = compact.reaches_sink()
+    cached_soft_shortest_path(compact, 0, 29, 0.5, cache=cache)
+    cached_compute_path_stats(compact, 0, 29, cache=cache)
+    assert "networkx" not in compact._cache
+
+    assert value == pytest.approx(soft_shortest_path_dag(dag, 0, 29, 0.5)[0], rel=1e-12)
+    assert stats == compute_path_stats(dag, 0, 29)
+    assert cost == shortest_path_cost(dag.graph, 0, 29)
+    assert reach == dag.reaches_sink()
+
+
+def test_edges_pickle_and_copy() -> None:
+    edge = Edge(1, 2, 3.0)
+    assert pickle.loads(pickle.dumps(edge)) == edge
+    assert copy.deepcopy(edge) == edge and copy.copy(edge) == edge
+    _, compact = build_pair(4)
+    assert pickle.loads(pickle.dumps(compact.edges())) == compact.edges()
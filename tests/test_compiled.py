@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from src.classical_shortest_path import shortest_path_values_targets
+from src.compiled import compile_dag
+from src.entropy_regularized import (
+    soft_shortest_path_compiled,
+    soft_shortest_path_dag,
+    soft_shortest_path_temperatures,
+    soft_values_compiled,
+    soft_values_parallel,
+    soft_values_targets,
+)
+from src.graph import load_dag_from_json
+from graph_factories import generate_random_dag
+
+
+def test_compiled_layout_is_reverse_topological() -> None:
+    rng = np.random.default_rng(1)
+    graph = generate_random_dag(rng, 30, 0.2, low=-0.5, high=2.0)
+    compiled = compile_dag(graph)
+
+    assert compiled.n_nodes == graph.number_of_nodes()
+    assert compiled.n_edges == graph.number_of_edges()
+    for i in range(compiled.n_nodes):
+        lo, hi = compiled.indptr[i], compiled.indptr[i + 1]
+        for j, w in zip(compiled.indices[lo:hi], compiled.weights[lo:hi]):
+            assert j < i
+            u, v = compiled.nodes[i], compiled.nodes[j]
+            assert graph[u][v]["weight"] == w
+    with pytest.raises(ValueError):
+        compiled.weights[0] = 0.0
+
+
+def test_compiled_rejects_cycles() -> None:
+    graph = nx.DiGraph([("a", "b"), ("b", "c"), ("c", "a")])
+    with pytest.raises(ValueError):
+        compile_dag(graph)
+
+
+def test_compiled_soft_values_match_reference() -> None:
+    rng = np.random.default_rng(0)
+    for _ in range(30):
+        graph = generate_random_dag(rng, int(rng.integers(2, 25)), float(rng.uniform(0.1, 0.6)), low=-0.5, high=2.0)
+        compiled = compile_dag(graph)
+        source, target = 0, int(rng.integers(1, graph.number_of_nodes()))
+        for temperature in [0.05, 0.5, 2.0]:
+            ref, ref_all = soft_shortest_path_dag(graph, source, target, temperature)
+            value, values = soft_shortest_path_compiled(compiled, source, target, temperature)
+            got_all = compiled.to_dict(values)
+            assert got_all.keys() == ref_all.keys()
+            for node, expected in ref_all.items():
+                if np.isinf(expected):
+                    assert np.isinf(got_all[node])
+                else:
+                    assert abs(got_all[node] - expected) <= 1e-9
+            assert value == got_all[source]
+
+
+def test_compiled_sample_dag() -> None:
+    dag = load_dag_from_json("data/sample_dag.json")
+    compiled = compile_dag(dag)
+    ref, _ = soft_shortest_path_dag(dag.to_networkx(), dag.source, dag.sink, 0.5)
+    value, _ = soft_shortest_path_compiled(compiled, dag.source, dag.sink, 0.5)
+    assert abs(value - ref) <= 1e-12
+
+
+def test_temperature_grid_matches_per_temperature_runs() -> None:
+    rng = np.random.default_rng(3)
+    graph = generate_random_dag(rng, 20, 0.3, low=-0.5, high=2.0)
+    temps = np.logspace(-2, 1, 17)
+    at_source, matrix = soft_shortest_path_temperatures(graph, 0, 19, temps)
+
+    assert matrix.shape == (temps.size, graph.number_of_nodes())
+    nodes = list(graph.nodes)
+    for row, temperature in enumerate(temps):
+        _, ref_all = soft_shortest_path_dag(graph, 0, 19, temperature)
+        assert at_source[row] == matrix[row, nodes.index(0)]
+        for col, node in enumerate(nodes):
+            expected = ref_all[node]
+            if np.isinf(expected):
+                assert np.isinf(matrix[row, col])
+            else:
+                assert abs(matrix[row, col] - expected) <= 1e-9
+
+    with pytest.raises(ValueError):
+        soft_shortest_path_temperatures(graph, 0, 19, np.array([0.5, 0.0]))
+
+
+def test_multi_target_blocks_match_single_target_runs() -> None:
+    rng = np.random.default_rng(5)
+    graph = generate_random_dag(rng, 25, 0.3, low=-0.5, high=2.0)
+    compiled = compile_dag(graph)
+    targets = list(range(5, 25, 2))
+
+    soft = soft_values_targets(compiled, targets, 0.5, block_size=3)
+    hard = shortest_path_values_targets(compiled, targets, block_size=4)
+    assert soft.shape == hard.shape == (compiled.n_nodes, len(targets))
+
+    for col, target in enumerate(targets):
+        expected_soft = soft_values_compiled(compiled, target, 0.5)
+        assert np.array_equal(soft[:, col], expected_soft)
+        for row, node in enumerate(compiled.nodes):
+            if nx.has_path(graph, node, target):
+                expected = nx.bellman_ford_path_length(graph, node, target)
+                assert abs(hard[row, col] - expected) <= 1e-12
+            else:
+                assert np.isinf(hard[row, col])
+
+
+def test_parallel_engine_is_bit_identical_to_serial() -> None:
+    rng = np.random.default_rng(7)
+    graph = generate_random_dag(rng, 120, 0.3, low=-0.5, high=2.0)
+    compiled = compile_dag(graph)
+    for temperature in [0.01, 0.7]:
+        serial = soft_values_compiled(compiled, 119, temperature)
+        for workers in [2, 3]:
+            threaded = soft_values_parallel(compiled, 119, temperature, workers=workers, min_chunk_edges=8)
+            assert np.array_equal(serial, threaded)
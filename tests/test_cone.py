@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import networkx as nx
+import numpy as np
+
+from src.bounds import compute_path_stats
+from src.compiled import compile_dag
+from src.cone import ConeQuery, soft_shortest_path_pruned, st_cone
+from src.entropy_regularized import soft_shortest_path_dag
+from graph_factories import generate_random_dag
+
+
+def test_cone_is_intersection_of_reachability() -> None:
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        graph = generate_random_dag(rng, int(rng.integers(4, 30)), float(rng.uniform(0.05, 0.4)))
+        source, target = 1, max(graph.nodes) - 1
+        cone = st_cone(compile_dag(graph), source, target)
+        expected = (nx.descendants(graph, source) | {source}) & (nx.ancestors(graph, target) | {target})
+        assert set(cone.nodes) == expected | {source, target}
+        assert cone.n_edges == graph.subgraph(expected).number_of_edges()
+
+
+def test_pruned_values_match_full_dp() -> None:
+    rng = np.random.default_rng(1)
+    for _ in range(20):
+        graph = generate_random_dag(rng, int(rng.integers(4, 30)), float(rng.uniform(0.1, 0.5)))
+        target = max(graph.nodes)
+        for temperature in [0.2, 1.0]:
+            ref, ref_all = soft_shortest_path_dag(graph, 0, target, temperature)
+            value, got_all = soft_shortest_path_pruned(graph, 0, target, temperature)
+            assert value == ref or abs(value - ref) <= 1e-9
+            for node, got in got_all.items():
+                assert got == ref_all[node] or abs(got - ref_all[node]) <= 1e-9
+
+
+def test_cone_query_reuses_cone_across_temperatures() -> None:
+    rng = np.random.default_rng(2)
+    graph = generate_random_dag(rng, 40, 0.2)
+    graph.add_edge(0, 39, weight=50.0)
+    query = ConeQuery(graph, 0, 39)
+    temps = np.array([0.1, 0.5, 2.0])
+    values = query.soft_value_temperatures(temps)
+    for T, got in zip(temps, values):
+        assert abs(got - soft_shortest_path_dag(graph, 0, 39, T)[0]) <= 1e-9
+    assert query.soft_value(0.5) == values[1]
+    assert abs(query.hard_value() - compute_path_stats(graph, 0, 39)["d_star"]) <= 1e-9
+
+
+def test_unreachable_target_gives_infinity() -> None:
+    graph = nx.DiGraph()
+    graph.add_edge("s", "a", weight=1.0)
+    graph.add_edge("b", "t", weight=1.0)
+    query = ConeQuery(graph, "s", "t")
+    assert not query.reachable
+    assert query.cone.n_nodes == 2
+    assert np.isinf(query.soft_value(1.0))
+    assert np.isinf(query.hard_value())
+
+
+def test_networkx_cone_matches_compiled_cone_and_skips_the_rest() -> None:
+    rng = np.random.default_rng(4)
+    graph = generate_random_dag(rng, 40, 0.15)
+    # A large region hanging off the target never enters the compile step.
+    for i in range(2000):
+        graph.add_edge(39, ("tail", i), weight=1.0)
+    graph.add_edge(("tail", 0), ("tail", 1), weight=1.0)
+
+    pruned = ConeQuery(graph, 2, 39)
+    full = ConeQuery(compile_dag(graph), 2, 39)
+    assert set(pruned.cone.nodes) == set(full.cone.nodes)
+    assert pruned.cone.n_edges == full.cone.n_edges
+    assert abs(pruned.soft_value(0.3) - full.soft_value(0.3)) <= 1e-12
+    assert pruned.hard_value() == full.hard_value()
+    assert not ConeQuery(graph, 39, 2).reachable
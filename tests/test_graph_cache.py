@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import networkx as nx
+import pytest
+
+from src.bounds import compute_path_stats
+from src.entropy_regularized import soft_shortest_path_dag
+from src.graph import DAG
+
+
+def _diamond() -> DAG:
+    dag = DAG()
+    dag.add_edge("s", "a", 1.0)
+    dag.add_edge("s", "b", 2.0)
+    dag.add_edge("a", "t", 1.0)
+    dag.add_edge("b", "t", 0.5)
+    dag.set_source_sink("s", "t")
+    return dag
+
+
+def test_topological_order_is_cached_until_mutation(monkeypatch: pytest.MonkeyPatch) -> None:
+    dag = _diamond()
+    calls = []
+    original = nx.topological_sort
+
+    def counting(graph):
+        calls.append(1)
+        return original(graph)
+
+    monkeypatch.setattr(nx, "topological_sort", counting)
+    first = dag.topological_order()
+    assert dag.is_acyclic()
+    dag.validate_acyclic()
+    assert dag.topological_order() is first
+    assert len(calls) == 1
+
+    dag.add_edge("t", "u", 1.0)
+    assert dag.topological_order()[-1] == "u"
+    assert len(calls) == 2
+
+
+def test_cycle_detected_after_mutation() -> None:
+    dag = _diamond()
+    assert dag.is_acyclic()
+    dag.add_edge("t", "s", 1.0)
+    assert not dag.is_acyclic()
+    with pytest.raises(ValueError):
+        dag.topological_sort()
+    with pytest.raises(ValueError, match="soft_shortest_path_dag"):
+        soft_shortest_path_dag(dag, "s", "t", 1.0)
+    with pytest.raises(ValueError, match="compute_path_stats"):
+        compute_path_stats(dag, "s", "t")
+
+
+def test_depth_layers_and_reaches_sink() -> None:
+    dag = _diamond()
+    dag.add_edge("x", "a", 1.0)
+    dag.add_edge("a", "y", 1.0)
+    assert [sorted(layer) for layer in dag.depth_layers()] == [["t", "y"], ["a", "b"], ["s", "x"]]
+    assert dag.reaches_sink() == frozenset({"s", "a", "b", "t", "x"})
+
+    dag.depth_layers()[0].append("mutated")
+    assert "mutated" not in dag.depth_layers()[0]
+
+
+def test_wrapper_matches_networkx_results() -> None:
+    dag = _diamond()
+    graph = dag.to_networkx()
+    assert soft_shortest_path_dag(dag, "s", "t", 0.7) == soft_shortest_path_dag(graph, "s", "t", 0.7)
+    assert compute_path_stats(dag, "s", "t") == compute_path_stats(graph, "s", "t")
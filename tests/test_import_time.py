@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+from benchmarks.import_time import ROOT, main, measure_import
+
+# Sixteen threads make the first networkx/scipy use at the same moment.
+_FIRST_USE_RACE = """
+import sys, threading
+from concurrent.futures import ThreadPoolExecutor
+from src.entropy_regularized import soft_shortest_path_dag
+from src.graph import DAG
+
+assert "networkx" not in sys.modules
+barrier = threading.Barrier(16)
+
+def first_call(i):
+    barrier.wait()
+    dag = DAG()
+    dag.add_edge("s", "a", 1.0)
+    dag.add_edge("a", "t", 1.0)
+    dag.add_edge("s", "t", 2.5)
+    return soft_shortest_path_dag(dag, "s", "t", 0.5)[0]
+
+with ThreadPoolExecutor(16) as pool:
+    values = list(pool.map(first_call, range(16)))
+assert len(set(values)) == 1, values
+"""
+
+
+def test_importing_src_loads_no_heavy_dependencies() -> None:
+    assert measure_import("src", repeat=1)["loaded"] == []
+
+
+def test_engines_defer_networkx_scipy_and_matplotlib() -> None:
+    for module in ["src.entropy_regularized", "src.service", "src.cache", "experiments.cost_margin"]:
+        loaded = measure_import(module, repeat=1)["loaded"]
+        assert "scipy.special" not in loaded and "scipy.sparse" not in loaded and "matplotlib" not in loaded
+        if module.startswith("src."):
+            assert "networkx" not in loaded
+
+
+def test_lazy_exports_resolve() -> None:
+    import src
+    from src.entropy_regularized import soft_shortest_path
+
+    assert src.soft_shortest_path is soft_shortest_path
+    assert "soft_hard_gap_bound" in dir(src)
+
+
+def test_budget_gate_exit_code() -> None:
+    # Timing budgets are checked by running benchmarks/import_time.py, not here.
+    assert main(["--modules", "src.entropy_regularized", "--repeat", "1", "--budget", "0"]) == 1
+
+
+def test_first_use_from_many_threads_is_safe() -> None:
+    for _ in range(3):
+        subprocess.run([sys.executable, "-c", _FIRST_USE_RACE], cwd=ROOT, check=True, capture_output=True)
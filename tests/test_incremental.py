@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.entropy_regularized import soft_shortest_path_values
+from src.graph import CompactDAG, DAG
+from src.incremental import IncrementalSoftValues
+from graph_factories import generate_random_dag, to_dag
+
+
+def assert_matches_full_recompute(engine: IncrementalSoftValues, tol: float) -> None:
+    expected = soft_shortest_path_values(engine.dag.to_networkx(), engine.target, engine.temperature)
+    assert engine.values.keys() == expected.keys()
+    for node, value in expected.items():
+        if np.isinf(value):
+            assert np.isinf(engine.values[node])
+        else:
+            assert abs(engine.values[node] - value) <= tol
+
+
+def test_incremental_updates_match_full_recompute() -> None:
+    rng = np.random.default_rng(0)
+    n = 25
+    dag = to_dag(generate_random_dag(rng, n, 0.25, high=2.0))
+    engine = IncrementalSoftValues(dag, target=n - 1, temperature=0.4)
+
+    for _ in range(60):
+        edges = dag.edges()
+        if rng.random() < 0.5 and edges:
+            edge = edges[int(rng.integers(len(edges)))]
+            engine.update_weight(edge.u, edge.v, float(rng.uniform(0.1, 2.0)))
+        else:
+            i, j = sorted(int(x) for x in rng.choice(n, size=2, replace=False))
+            engine.add_edge(i, j, float(rng.uniform(0.1, 2.0)))
+        assert_matches_full_recompute(engine, 1e-9)
+
+    engine.add_edge("new_source", 0, 0.5)
+    engine.add_edge(n - 2, "new_sink", 0.5)
+    assert_matches_full_recompute(engine, 1e-9)
+
+
+def test_incremental_only_touches_ancestors() -> None:
+    dag = DAG()
+    for i in range(50):
+        dag.add_edge(i, i + 1, 1.0)
+    dag.add_edge("side", 49, 1.0)
+    engine = IncrementalSoftValues(dag, target=50, temperature=0.5)
+
+    assert engine.update_weight("side", 49, 2.0) == 1
+    assert engine.update_weight(2, 3, 3.0) == 3
+    assert_matches_full_recompute(engine, 1e-12)
+
+
+def test_incremental_rejects_cycles() -> None:
+    dag = DAG()
+    dag.add_edge("a", "b", 1.0)
+    dag.add_edge("b", "c", 1.0)
+    engine = IncrementalSoftValues(dag, target="c", temperature=0.5)
+    with pytest.raises(ValueError):
+        engine.add_edge("c", "a", 1.0)
+    assert not dag.to_networkx().has_edge("c", "a")
+    with pytest.raises(ValueError):
+        engine.update_weight("a", "c", 1.0)
+
+
+def test_incremental_updates_custom_weight_attribute() -> None:
+    dag = DAG()
+    dag.graph.add_edge("s", "a", cost=1.0)
+    dag.graph.add_edge("a", "t", cost=1.0)
+    dag.graph.add_edge("s", "t", cost=5.0)
+    engine = IncrementalSoftValues(dag, target="t", temperature=0.5, weight="cost")
+    before = engine.value("s")
+
+    version = dag.version
+    engine.update_weight("s", "t", 0.1)
+    assert dag.graph["s"]["t"] == {"cost": 0.1}
+    assert dag.version > version
+    engine.add_edge("s", "b", 0.2)
+    engine.add_edge("b", "t", 0.2)
+    assert engine.value("s") < before
+    expected = soft_shortest_path_values(dag.to_networkx(), "t", 0.5, weight="cost")
+    assert all(abs(engine.values[v] - expected[v]) <= 1e-12 for v in expected if np.isfinite(expected[v]))
+    assert dag.topological_order().index("b") < dag.topological_order().index("t")
+
+
+def test_compact_dag_reorders_after_the_inserted_edge() -> None:
+    rng = np.random.default_rng(5)
+    for _ in range(50):
+        dag = to_dag(generate_random_dag(rng, 8, 0.2, high=2.0), CompactDAG)
+        engine = IncrementalSoftValues(dag, target=7, temperature=0.5)
+        for _ in range(12):
+            u, v = sorted(int(x) for x in rng.choice(8, size=2, replace=False))
+            engine.add_edge(u, v, float(rng.uniform(0.1, 2.0)))
+            assert all(engine._pos[e.u] < engine._pos[e.v] for e in dag.edges())
+        assert "networkx" not in dag._cache
+        expected = soft_shortest_path_values(dag.to_networkx(), 7, 0.5)
+        assert all(abs(engine.values[v] - expected[v]) <= 1e-12 for v in expected if np.isfinite(expected[v]))
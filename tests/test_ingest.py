@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import networkx as nx
+import numpy as np
+import pytest
+
+import src.ingest as ingest
+from src.binary_format import convert_json_to_binary
+from src.classical_shortest_path import shortest_path_values_targets
+from src.compiled import compile_dag
+from src.entropy_regularized import soft_values_compiled
+from src.ingest import EdgeListReader, ingest_edge_list
+
+
+def random_edges(rng: np.random.Generator, n: int, m: int) -> list:
+    edges = []
+    for _ in range(m):
+        i, j = sorted(int(x) for x in rng.choice(n, 2, replace=False))
+        edges.append([i, j, float(rng.uniform(0.1, 3.0))])
+    # Repeated pairs: the last weight must win, as with nx.DiGraph.add_edge.
+    edges += [[u, v, 7.5] for u, v, _ in edges[:10]]
+    return edges
+
+
+def test_json_ingestion_matches_in_memory_compile(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Tiny read blocks force values to straddle buffer refills.
+    monkeypatch.setattr(ingest, "_READ_BLOCK", 5)
+    rng = np.random.default_rng(0)
+    edges = random_edges(rng, 60, 400)
+    path = tmp_path / "g.json"
+    path.write_text(json.dumps({"nodes": list(range(62)), "edges": edges, "source": 0, "sink": 59}, indent=1))
+    reference = convert_json_to_binary(str(path), str(tmp_path / "ref.bin"))
+
+    for chunk_edges in [1, 13, 10_000]:
+        compiled, source, sink = ingest_edge_list(str(path), str(tmp_path / "g.bin"), chunk_edges=chunk_edges)
+        assert (source, sink) == (0, 59)
+        assert isinstance(compiled.indices, np.memmap)
+        assert tuple(compiled.nodes) == tuple(reference.nodes)
+        for name in ["indptr", "indices", "weights", "level_ptr"]:
+            assert np.array_equal(getattr(compiled, name), getattr(reference, name))
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["g.bin", "g.json", "ref.bin"]
+
+
+def test_csv_and_ndjson_readers(tmp_path: Path) -> None:
+    csv_path = tmp_path / "edges.csv"
+    csv_path.write_text("target,source,cost\nb,a,1.5\nc,b,2\nc,a,4\n")
+    ndjson_path = tmp_path / "edges.ndjson"
+    ndjson_path.write_text('{"u": "a", "v": "b", "weight": 1.5}\n\n["b", "c", 2]\n["a", "c"]\n')
+
+    chunks = list(EdgeListReader(str(csv_path), chunk_edges=2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert chunks[0].tails == ["a", "b"] and chunks[0].heads == ["b", "c"]
+    assert chunks[0].weights == [1.5, 2.0]
+
+    (chunk,) = EdgeListReader(str(ndjson_path))
+    assert list(zip(chunk.tails, chunk.heads, chunk.weights)) == [("a", "b", 1.5), ("b", "c", 2.0), ("a", "c", 1.0)]
+
+    headerless = tmp_path / "plain.csv"
+    headerless.write_text("a,b\nb,c\n")
+    (chunk,) = EdgeListReader(str(headerless))
+    assert chunk.tails == ["a", "b"] and chunk.weights == [1.0, 1.0]
+
+    compiled, source, sink = ingest_edge_list(str(csv_path), str(tmp_path / "csv.bin"), source="a", sink="c")
+    assert (source, sink) == ("a", "c")
+    graph = nx.DiGraph([("a", "b", {"weight": 1.5}), ("b", "c", {"weight": 2.0}), ("a", "c", {"weight": 4.0})])
+    expected = compile_dag(graph).to_dict(soft_values_compiled(compile_dag(graph), "c", 0.5))
+    assert compiled.to_dict(soft_values_compiled(compiled, "c", 0.5)) == expected
+
+
+def test_unknown_format_is_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        EdgeListReader(str(tmp_path / "edges.txt"))
+
+
+def test_block_bounded_engines_are_bit_identical(tmp_path: Path) -> None:
+    rng = np.random.default_rng(1)
+    path = tmp_path / "g.json"
+    path.write_text(json.dumps({"edges": random_edges(rng, 80, 600)}))
+    compiled, _, _ = ingest_edge_list(str(path), str(tmp_path / "g.bin"), chunk_edges=50)
+    target = compiled.nodes[0]
+
+    for max_block_edges in [1, 17]:
+        assert np.array_equal(
+            soft_values_compiled(compiled, target, 0.3, max_block_edges=max_block_edges),
+            soft_values_compiled(compiled, target, 0.3),
+        )
+        assert np.array_equal(
+            shortest_path_values_targets(compiled, [target], max_block_edges=max_block_edges),
+            shortest_path_values_targets(compiled, [target]),
+        )
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import networkx as nx
+
+from src import instrumentation
+from src.bounds import compute_path_stats, compute_path_stats_enumeration
+from src.compiled import compile_dag
+from src.entropy_regularized import soft_shortest_path_dag, soft_values_compiled
+
+
+def build_graph() -> nx.DiGraph:
+    graph = nx.DiGraph()
+    graph.add_edge("s", "a", weight=1.0)
+    graph.add_edge("s", "b", weight=1.1)
+    graph.add_edge("a", "t", weight=1.0)
+    graph.add_edge("b", "t", weight=0.9)
+    graph.add_edge("a", "c", weight=0.8)
+    graph.add_edge("c", "t", weight=0.7)
+    return graph
+
+
+def test_disabled_by_default_and_records_nothing() -> None:
+    assert not instrumentation.enabled()
+    assert instrumentation.phase("x") is instrumentation.phase("y")
+    soft_shortest_path_dag(build_graph(), "s", "t", 0.5)
+
+
+def test_profile_collects_phases_and_counters() -> None:
+    graph = build_graph()
+    seen = []
+    with instrumentation.profile(callback=seen.append) as prof:
+        assert instrumentation.enabled()
+        soft_shortest_path_dag(graph, "s", "t", 0.5)
+        compute_path_stats(graph, "s", "t")
+        compute_path_stats_enumeration(graph, "s", "t")
+    assert not instrumentation.enabled()
+    assert seen == [prof]
+
+    totals = prof.totals()
+    for name in [
+        "soft_shortest_path_dag.validate",
+        "soft_shortest_path_dag.dp",
+        "compute_path_stats.validate",
+        "compute_path_stats.dp",
+        "enumerate_path_costs",
+    ]:
+        assert totals[name]["calls"] == 1
+        assert totals[name]["total_s"] >= 0.0
+    assert prof.counters["nodes"] == 2 * graph.number_of_nodes()
+    assert prof.counters["edges"] == 2 * graph.number_of_edges()
+    assert prof.counters["logsumexp_calls"] == 4
+    assert prof.counters["paths_enumerated"] == 3
+
+
+def test_compiled_engine_counters_and_nesting() -> None:
+    compiled = compile_dag(build_graph())
+    with instrumentation.profile() as outer:
+        with instrumentation.profile() as inner:
+            soft_values_compiled(compiled, "t", 0.5)
+        soft_values_compiled(compiled, "t", 0.5)
+    assert inner.counters["edges"] == compiled.n_edges
+    assert inner.counters["logsumexp_calls"] == compiled.n_levels - 1
+    assert outer.counters["edges"] == compiled.n_edges
+    assert [r.name for r in inner.phases] == ["backward_sweep"]
+
+
+def test_json_and_chrome_trace_export(tmp_path: Path) -> None:
+    with instrumentation.profile() as prof:
+        soft_shortest_path_dag(build_graph(), "s", "t", 0.5)
+    prof.to_json(str(tmp_path / "profile.json"))
+    prof.to_chrome_trace(str(tmp_path / "trace.json"))
+
+    data = json.loads((tmp_path / "profile.json").read_text())
+    assert data["counters"]["nodes"] == 5
+    assert {p["name"] for p in data["phases"]} == set(data["totals"])
+
+    trace = json.loads((tmp_path / "trace.json").read_text())
+    complete = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    counters = [e for e in trace["traceEvents"] if e["ph"] == "C"]
+    assert [e["name"] for e in complete] == ["soft_shortest_path_dag.validate", "soft_shortest_path_dag.dp"]
+    assert all(e["dur"] >= 0 for e in complete)
+    assert {e["name"] for e in counters} == {"nodes", "edges", "logsumexp_calls"}
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import itertools
+
+import networkx as nx
+import numpy as np
+
+from src.bounds import enumerate_path_costs
+from src.k_shortest_paths import iter_path_costs_sorted
+from graph_factories import generate_random_dag
+
+
+def path_cost(graph: nx.DiGraph, path: list) -> float:
+    return sum(graph[u][v]["weight"] for u, v in zip(path[:-1], path[1:]))
+
+
+def test_sorted_costs_match_enumeration() -> None:
+    rng = np.random.default_rng(0)
+    for _ in range(40):
+        graph = generate_random_dag(rng, int(rng.integers(3, 12)), float(rng.uniform(0.2, 0.7)), low=-0.5, high=2.0)
+        target = max(graph.nodes)
+        expected = sorted(enumerate_path_costs(graph, 0, target))
+        results = list(iter_path_costs_sorted(graph, 0, target, return_paths=True))
+
+        assert len(results) == len(expected)
+        costs = [c for c, _ in results]
+        assert all(a <= b for a, b in zip(costs[:-1], costs[1:]))
+        assert np.allclose(costs, expected, rtol=0, atol=1e-9)
+        paths = [tuple(p) for _, p in results]
+        assert len(set(paths)) == len(paths)
+        for cost, path in results:
+            assert path[0] == 0 and path[-1] == target
+            assert abs(path_cost(graph, path) - cost) <= 1e-9
+
+
+def test_early_termination() -> None:
+    graph = nx.DiGraph()
+    for i in range(30):
+        graph.add_edge("s", i, weight=1.0)
+        graph.add_edge(i, "t", weight=0.1 * i)
+
+    top = list(iter_path_costs_sorted(graph, "s", "t", max_paths=5))
+    assert np.allclose(top, [1.0, 1.1, 1.2, 1.3, 1.4])
+
+    within = list(iter_path_costs_sorted(graph, "s", "t", max_cost=1.0 + 0.35))
+    assert len(within) == 4
+
+    lazy = iter_path_costs_sorted(graph, "s", "t")
+    assert list(itertools.islice(lazy, 2)) == top[:2]
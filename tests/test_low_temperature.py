@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import math
+
+import networkx as nx
+import numpy as np
+
+from src.compiled import compile_dag
+from src.entropy_regularized import (
+    soft_gap_values,
+    soft_shortest_path_dag,
+    soft_shortest_path_low_temperature,
+)
+from graph_factories import generate_random_dag
+
+
+def test_low_temperature_matches_reference() -> None:
+    rng = np.random.default_rng(0)
+    for _ in range(30):
+        graph = generate_random_dag(rng, int(rng.integers(3, 20)), float(rng.uniform(0.2, 0.6)), low=-0.5, high=2.0)
+        target = max(graph.nodes)
+        for temperature in [1e-3, 0.05, 0.5]:
+            _, ref_all = soft_shortest_path_dag(graph, 0, target, temperature)
+            _, got_all = soft_shortest_path_low_temperature(graph, 0, target, temperature)
+            for node, expected in ref_all.items():
+                if np.isinf(expected):
+                    assert np.isinf(got_all[node])
+                else:
+                    assert abs(got_all[node] - expected) <= 1e-9
+
+
+def test_gap_keeps_relative_precision_below_float_resolution() -> None:
+    graph = nx.DiGraph()
+    graph.add_edge("s", "a", weight=1.0)
+    graph.add_edge("a", "t", weight=1.0)
+    graph.add_edge("s", "b", weight=1.0)
+    graph.add_edge("b", "t", weight=1.5)
+    compiled = compile_dag(graph)
+    s = compiled.node_id("s")
+
+    for temperature in [1e-1, 1e-2, 1e-3]:
+        d_star, gap = soft_gap_values(compiled, "t", temperature, cutoff=np.inf)
+        expected = temperature * math.log1p(math.exp(-0.5 / temperature))
+        assert d_star[s] == 2.0
+        assert abs(gap[s] - expected) <= 1e-12 * expected
+
+    _, pruned = soft_gap_values(compiled, "t", 1e-3)
+    assert pruned[s] == 0.0
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import random
+
+import numpy as np
+
+from experiments.parallel import map_sweep
+
+
+def noisy_point(x: float) -> float:
+    return x + np.random.random() + random.random()
+
+
+def test_map_sweep_is_ordered_and_reproducible() -> None:
+    points = [float(i) for i in range(12)]
+    serial = map_sweep(noisy_point, points, workers=1, seed=3)
+    pooled = map_sweep(noisy_point, points, workers=3, seed=3)
+    assert serial == pooled
+    assert all(p <= v < p + 2 for p, v in zip(points, serial))
+    assert map_sweep(noisy_point, points, workers=1, seed=4) != serial
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import math
+
+import networkx as nx
+import numpy as np
+
+from src.bounds import (
+    compute_path_stats,
+    compute_path_stats_enumeration,
+    log_path_stats,
+    theorem_iii_1_upper_bound,
+    theorem_iii_1_upper_bound_log,
+)
+from graph_factories import generate_random_dag
+
+
+def coarse_weight(rng: np.random.Generator) -> float:
+    # Coarse weights make ties (several optimal paths) common.
+    return float(rng.integers(1, 4)) * 0.5
+
+
+def build_layered_dag(n_layers: int) -> nx.DiGraph:
+    graph = nx.DiGraph()
+    for k in range(n_layers):
+        graph.add_edge(k, ("hi", k), weight=1.0)
+        graph.add_edge(k, ("lo", k), weight=0.5)
+        graph.add_edge(("hi", k), k + 1, weight=1.0)
+        graph.add_edge(("lo", k), k + 1, weight=1.0)
+    return graph
+
+
+def test_dp_path_stats_match_enumeration() -> None:
+    rng = np.random.default_rng(0)
+    checked = 0
+    while checked < 100:
+        graph = generate_random_dag(rng, int(rng.integers(3, 12)), float(rng.uniform(0.2, 0.7)), weight=coarse_weight)
+        target = max(graph.nodes)
+        if not nx.has_path(graph, 0, target):
+            continue
+        assert compute_path_stats(graph, 0, target) == compute_path_stats_enumeration(graph, 0, target)
+        checked += 1
+
+
+def test_dp_path_stats_count_exponentially_many_paths() -> None:
+    n_layers = 80
+    stats = compute_path_stats(build_layered_dag(n_layers), 0, n_layers)
+    assert stats["n_tot"] == 2**n_layers
+    assert stats["n_sub"] == 2**n_layers - 1
+    assert stats["d_star"] == 1.5 * n_layers
+    assert stats["delta"] == 0.5
+
+
+def test_log_path_stats_match_exact_counts() -> None:
+    rng = np.random.default_rng(3)
+    checked = 0
+    for _ in range(60):
+        graph = generate_random_dag(rng, int(rng.integers(3, 16)), float(rng.uniform(0.2, 0.6)), weight=coarse_weight)
+        target = max(graph.nodes)
+        if not nx.has_path(graph, 0, target):
+            continue
+        exact = compute_path_stats(graph, 0, target)
+        logged = log_path_stats(graph, 0, target)
+        assert logged["d_star"] == exact["d_star"]
+        assert logged["delta"] == exact["delta"]
+        assert abs(logged["log_n_tot"] - math.log(exact["n_tot"])) <= 1e-12
+        if exact["n_sub"]:
+            assert abs(logged["log_n_sub"] - math.log(exact["n_sub"])) <= 1e-12
+        else:
+            assert logged["log_n_sub"] == -np.inf
+        checked += 1
+    assert checked > 20
+
+
+def test_log_path_stats_and_bound_do_not_overflow() -> None:
+    # 2^1200 paths; every path other than the all-"lo" one is sub-optimal.
+    graph = build_layered_dag(1200)
+    stats = log_path_stats(graph, 0, 1200)
+    assert stats["d_star"] == 1.5 * 1200
+    assert stats["delta"] == 0.5
+    assert abs(stats["log_n_tot"] - 1200 * math.log(2)) <= 1e-9
+    assert stats["log_n_opt"] == 0.0
+    # log(2^1200 - 1), without cancellation against N_opt.
+    assert abs(stats["log_n_sub"] - 1200 * math.log(2)) <= 1e-9
+
+    bound = theorem_iii_1_upper_bound_log(0.1, stats["log_n_sub"], stats["delta"])
+    assert np.isfinite(bound)
+    assert abs(bound - 0.1 * (stats["log_n_sub"] - 5.0)) <= 1e-9
+    assert abs(theorem_iii_1_upper_bound(0.1, 2**1200 - 1, 0.5) - bound) <= 1e-9
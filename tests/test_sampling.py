@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from collections import Counter
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from src.compiled import compile_dag
+from src.entropy_regularized import soft_hard_sweep, soft_shortest_path_dag
+from src.sampling import BoltzmannPathSampler, _alias_tables
+from graph_factories import generate_random_dag
+
+
+def build_test_dag() -> nx.DiGraph:
+    graph = nx.DiGraph()
+    graph.add_edge("s", "a", weight=1.0)
+    graph.add_edge("s", "b", weight=1.1)
+    graph.add_edge("a", "t", weight=1.0)
+    graph.add_edge("b", "t", weight=0.9)
+    graph.add_edge("a", "c", weight=0.8)
+    graph.add_edge("c", "t", weight=0.7)
+    graph.add_edge("s", "d", weight=0.2)  # dead end: d cannot reach t
+    return graph
+
+
+def test_alias_tables_reproduce_probabilities() -> None:
+    prob = np.array([0.1, 0.6, 0.3, 1.0, 0.0, 0.25, 0.75])
+    indptr = np.array([0, 3, 4, 7])
+    threshold, alias = _alias_tables(indptr, prob)
+    for v in range(3):
+        lo, hi = indptr[v], indptr[v + 1]
+        implied = np.zeros(hi - lo)
+        for j in range(lo, hi):
+            implied[j - lo] += threshold[j] / (hi - lo)
+            implied[alias[j] - lo] += (1.0 - threshold[j]) / (hi - lo)
+        assert np.allclose(implied, prob[lo:hi], atol=1e-12)
+
+
+def test_path_frequencies_follow_boltzmann_distribution() -> None:
+    graph = build_test_dag()
+    temperature = 0.7
+    dT_s, dT = soft_shortest_path_dag(graph, "s", "t", temperature)
+    sampler = BoltzmannPathSampler(graph, "t", temperature, d_T=dT)
+    sample = sampler.sample("s", 40_000, rng=0)
+
+    counts = Counter(tuple(path) for path in sample.paths())
+    assert set(counts) == {("s", "a", "t"), ("s", "b", "t"), ("s", "a", "c", "t")}
+    for path, n in counts.items():
+        cost = sum(graph[u][v]["weight"] for u, v in zip(path[:-1], path[1:]))
+        p = np.exp(-(cost - dT_s) / temperature)
+        assert abs(n / 40_000 - p) <= 4 * np.sqrt(p * (1 - p) / 40_000)
+    assert np.allclose(sample.log_probs, -(sample.costs - dT_s) / temperature, atol=1e-12)
+
+
+def test_estimates_match_exact_expected_cost_and_entropy() -> None:
+    graph = generate_random_dag(np.random.default_rng(5), 30, 0.3, 0.1, 3.0)
+    graph.add_edge(0, 29, weight=30.0)
+    temperature = 0.8
+    exact = soft_hard_sweep(graph, 0, 29, temperature)
+    compiled = exact.compiled
+    entropy = (exact.expected_cost - exact.d_T[compiled.node_id(0)]) / temperature
+
+    sampler = BoltzmannPathSampler(compiled, 29, temperature)
+    assert np.array_equal(sampler.d_T, exact.d_T)
+    est = sampler.estimate(0, 20_000, rng=1)
+    assert abs(est["expected_cost"] - exact.expected_cost) <= 5 * est["expected_cost_stderr"]
+    assert abs(est["entropy"] - entropy) <= 5 * est["entropy_stderr"]
+
+
+def test_sampler_rejects_bad_inputs() -> None:
+    graph = build_test_dag()
+    sampler = BoltzmannPathSampler(compile_dag(graph), "t", 0.5)
+    with pytest.raises(ValueError):
+        sampler.sample("d", 10)
+    with pytest.raises(ValueError):
+        sampler.estimate("s", 1)
+    with pytest.raises(ValueError):
+        BoltzmannPathSampler(graph, "t", 0.0)
+    assert sampler.sample("t", 3).paths() == [["t"], ["t"], ["t"]]
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.classical_shortest_path import dag_shortest_path_values
+from src.compiled import compile_dag
+from src.entropy_regularized import soft_values_compiled
+from src.service import ShortestPathService, solve_batch
+from graph_factories import generate_random_dag
+
+
+def reference(compiled, kind, source, target, temperature):
+    if kind == "soft":
+        return soft_values_compiled(compiled, target, temperature)[compiled.node_id(source)]
+    return dag_shortest_path_values(compiled, target)[0][compiled.node_id(source)]
+
+
+def test_solve_batch_matches_single_queries() -> None:
+    rng = np.random.default_rng(0)
+    compiled = compile_dag(generate_random_dag(rng, 30, 0.3))
+    queries = [("soft", 0, 29, 0.5), ("soft", 3, 29, 0.5), ("soft", 0, 20, 2.0), ("hard", 1, 29, None), ("hard", 2, 25, None)]
+    for query, got in zip(queries, solve_batch(compiled, queries)):
+        assert got == reference(compiled, *query)
+
+
+def test_small_blocks_match_one_block() -> None:
+    rng = np.random.default_rng(3)
+    compiled = compile_dag(generate_random_dag(rng, 40, 0.25))
+    queries = [
+        ("soft" if i % 2 else "hard", int(rng.integers(0, 10)), int(rng.integers(25, 40)), float(rng.choice([0.3, 1.5])))
+        for i in range(60)
+    ]
+    whole = solve_batch(compiled, queries, block_size=len(queries))
+    assert solve_batch(compiled, queries, block_size=3, max_block_edges=8) == whole
+    for query, got in zip(queries, whole):
+        assert got == reference(compiled, *query)
+    with pytest.raises(ValueError):
+        solve_batch(compiled, queries, block_size=0)
+
+
+def test_concurrent_queries_are_micro_batched() -> None:
+    rng = np.random.default_rng(1)
+    graph = generate_random_dag(rng, 40, 0.25)
+    compiled = compile_dag(graph)
+    queries = [
+        ("soft" if i % 3 else "hard", int(rng.integers(0, 10)), int(rng.integers(30, 40)), float(rng.choice([0.2, 1.0])))
+        for i in range(200)
+    ]
+
+    async def main():
+        async with ShortestPathService(batch_window=0.05) as service:
+            service.register("g", graph)
+            calls = [
+                service.soft_value("g", s, t, T) if kind == "soft" else service.hard_value("g", s, t)
+                for kind, s, t, T in queries
+            ]
+            return await asyncio.gather(*calls), service.batches_run
+
+    results, batches = asyncio.run(main())
+    assert batches == 1
+    for (kind, s, t, T), got in zip(queries, results):
+        assert got == reference(compiled, kind, s, t, T)
+
+
+def test_backpressure_limits_batch_size() -> None:
+    graph = generate_random_dag(np.random.default_rng(2), 20, 0.3)
+
+    async def main():
+        service = ShortestPathService(batch_window=0.01, max_in_flight=3)
+        service.register("g", graph)
+        await asyncio.gather(*(service.soft_value("g", 0, 19, 0.5) for _ in range(12)))
+        await service.close()
+        return service.batches_run
+
+    assert asyncio.run(main()) >= 4
+
+
+def test_cancelled_queries_are_dropped() -> None:
+    graph = generate_random_dag(np.random.default_rng(3), 20, 0.3)
+
+    async def main():
+        service = ShortestPathService(batch_window=0.05)
+        service.register("g", graph)
+        task = asyncio.ensure_future(service.soft_value("g", 0, 19, 0.5))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0.1)
+        await service.close()
+        return service.batches_run
+
+    assert asyncio.run(main()) == 0
+
+
+def test_invalid_queries_fail_fast() -> None:
+    graph = generate_random_dag(np.random.default_rng(4), 10, 0.3)
+
+    async def main():
+        async with ShortestPathService() as service:
+            service.register("g", graph)
+            with pytest.raises(ValueError):
+                await service.soft_value("g", 0, 9, 0.0)
+            with pytest.raises(ValueError):
+                await service.hard_value("g", "missing", 9)
+            with pytest.raises(ValueError):
+                await service.hard_value("other", 0, 9)
+
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import networkx as nx
+import numpy as np
+
+from src.classical_shortest_path import dag_shortest_path_lengths
+from src.entropy_regularized import soft_hard_sweep, soft_shortest_path_dag
+from graph_factories import generate_random_dag
+
+
+def build_test_dag() -> nx.DiGraph:
+    graph = nx.DiGraph()
+    graph.add_edge("s", "a", weight=1.0)
+    graph.add_edge("s", "b", weight=1.1)
+    graph.add_edge("a", "t", weight=1.0)
+    graph.add_edge("b", "t", weight=0.9)
+    graph.add_edge("a", "c", weight=0.8)
+    graph.add_edge("c", "t", weight=0.7)
+    graph.add_edge("t", "after", weight=0.3)
+    return graph
+
+
+def test_sweep_matches_separate_engines_and_enumeration() -> None:
+    graph = build_test_dag()
+    temperature = 0.6
+    sweep = soft_hard_sweep(graph, "s", "t", temperature)
+    compiled = sweep.compiled
+
+    dT, dT_all = soft_shortest_path_dag(graph, "s", "t", temperature)
+    d_star_all, _ = dag_shortest_path_lengths(graph, "t")
+    for node in graph.nodes:
+        i = compiled.node_id(node)
+        assert sweep.d_star[i] == d_star_all[node]
+        if np.isinf(dT_all[node]):
+            assert np.isinf(sweep.d_T[i])
+        else:
+            assert abs(sweep.d_T[i] - dT_all[node]) <= 1e-12
+
+    paths = list(nx.all_simple_paths(graph, "s", "t"))
+    costs = np.array([nx.path_weight(graph, p, "weight") for p in paths])
+    probs = np.exp(-(costs - dT) / temperature)
+    assert abs(probs.sum() - 1.0) <= 1e-12
+    assert abs(sweep.expected_cost - float(probs @ costs)) <= 1e-12
+
+    expected_marginals = {}
+    for p, path in zip(probs, paths):
+        for edge in zip(path[:-1], path[1:]):
+            expected_marginals[edge] = expected_marginals.get(edge, 0.0) + p
+    got = sweep.marginals_by_edge()
+    assert got.keys() == expected_marginals.keys()
+    for edge, value in expected_marginals.items():
+        assert abs(got[edge] - value) <= 1e-12
+
+
+def test_marginals_are_gradient_of_soft_value() -> None:
+    graph = generate_random_dag(np.random.default_rng(0), 12, 0.4, 0.1, 2.0)
+    graph.add_edge(0, 11, weight=3.0)
+    temperature = 0.8
+    sweep = soft_hard_sweep(graph, 0, 11, temperature)
+    marginals = sweep.marginals_by_edge()
+
+    eps = 1e-6
+    for u, v, data in graph.edges(data=True):
+        data["weight"] += eps
+        up, _ = soft_shortest_path_dag(graph, 0, 11, temperature)
+        data["weight"] -= 2 * eps
+        down, _ = soft_shortest_path_dag(graph, 0, 11, temperature)
+        data["weight"] += eps
+        assert abs((up - down) / (2 * eps) - marginals.get((u, v), 0.0)) <= 1e-6
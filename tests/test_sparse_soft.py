@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import numpy as np
+
+from src.compiled import compile_dag
+from src.entropy_regularized import soft_shortest_path_dag, soft_values_compiled
+from src.sparse_soft import SparseSoftEngine, soft_shortest_path_sparse
+from graph_factories import generate_random_dag
+
+
+def test_sparse_engine_matches_reference_dict() -> None:
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        graph = generate_random_dag(rng, int(rng.integers(3, 25)), float(rng.uniform(0.1, 0.6)))
+        target = max(graph.nodes)
+        for temperature in [0.3, 1.0]:
+            ref, ref_all = soft_shortest_path_dag(graph, 0, target, temperature)
+            value, got_all = soft_shortest_path_sparse(graph, 0, target, temperature)
+            assert got_all.keys() == ref_all.keys()
+            for node, expected in ref_all.items():
+                if np.isinf(expected):
+                    assert np.isinf(got_all[node])
+                else:
+                    assert abs(got_all[node] - expected) <= 1e-9
+
+
+def test_sparse_engine_is_stable_at_small_temperature() -> None:
+    rng = np.random.default_rng(1)
+    graph = generate_random_dag(rng, 40, 0.3)
+    compiled = compile_dag(graph)
+    engine = SparseSoftEngine(compiled)
+    for temperature in [1e-2, 1e-3, 1e-4]:
+        expected = soft_values_compiled(compiled, 39, temperature)
+        got = engine.values(39, temperature)
+        finite = np.isfinite(expected)
+        assert np.array_equal(finite, np.isfinite(got))
+        assert np.allclose(got[finite], expected[finite], rtol=0, atol=1e-9)